@@ -0,0 +1,23 @@
+"""
+Planner fixtures shared by the benchmarks, so every benchmark measures the same data
+"""
+
+import random
+from src.backend.internal.grid_manager import GridManager
+import src.backend.internal.time_blocks as tb
+
+NUM_NAMES = 20
+
+
+def build_manager() -> GridManager:
+    """Planner with NUM_NAMES names randomly allocated in every grid"""
+    random.seed(0)
+    manager = GridManager()
+    for grid_name, handler in manager.all_grids.items():
+        for i in range(NUM_NAMES):
+            name = f"NAME_{i}"
+            manager.add_name(name, grid_name)
+            for time_block in random.sample(tb.DAY_BLOCK_MAP[handler.day], 10):
+                handler.allocate_shift(handler.location, time_block, name)
+            manager.update_hours(name, grid_name)
+    return manager
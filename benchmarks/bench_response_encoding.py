@@ -0,0 +1,59 @@
+"""
+Benchmark per-endpoint JSON serialisation cost, stdlib json vs encode_json (orjson)
+
+Run from the repository root:
+    python -m benchmarks.bench_response_encoding
+"""
+
+import json
+import timeit
+from src.backend.internal.grid_manager import GridManager
+from src.backend.internal.json_encoder import encode_json
+from benchmarks._fixtures import build_manager
+
+NUMBER = 2000
+
+
+def stdlib_encode(content) -> bytes:
+    """Encoding used by fastapi's JSONResponse (old behaviour)"""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def payloads(manager: GridManager) -> dict:
+    """Response content of the larger planner endpoints"""
+    day1 = manager.all_grids["DAY1:MCC"]
+    day3 = manager.all_grids["DAY3:MCC"]
+    row_data, pinned_row_data = manager.get_all_hours()
+    return {
+        "/grid/": json.loads(day1.render_aggrid(manager.get_blocks_to_remove(1))),
+        "/grid/compressed": json.loads(
+            day3.render_aggrid(manager.get_blocks_to_remove(3), compressed=True)
+        ),
+        "/hours/": {"rowData": row_data, "pinnedBottomRowData": pinned_row_data},
+        "/grid/names/": {"names": sorted(day1.get_names())},
+    }
+
+
+def main():
+    manager = build_manager()
+    print(f"{'endpoint':<20} {'bytes':>8} {'stdlib':>12} {'encode_json':>12}")
+    for endpoint, content in payloads(manager).items():
+        assert stdlib_encode(content) == encode_json(content)
+        timings = [
+            timeit.timeit(lambda: func(content), number=NUMBER) / NUMBER * 1e6
+            for func in (stdlib_encode, encode_json)
+        ]
+        print(
+            f"{endpoint:<20} {len(encode_json(content)):>8} "
+            f"{timings[0]:9.1f} us {timings[1]:9.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
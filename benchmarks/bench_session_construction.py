@@ -0,0 +1,40 @@
+"""
+Benchmark per-session GridManager construction cost
+
+Run from the repository root:
+    python -m benchmarks.bench_session_construction
+"""
+
+import timeit
+from src.backend.internal.grid_handler import get_grid_template
+from src.backend.internal.grid_manager import GridManager, build_grid_handlers
+
+NUMBER = 2000
+
+
+def from_scratch_cold():
+    """Build every handler from scratch, re-parsing the template (old behaviour)"""
+    get_grid_template.cache_clear()
+    return build_grid_handlers()
+
+
+def from_scratch_warm():
+    """Build every handler from scratch with the template already parsed"""
+    return build_grid_handlers()
+
+
+def from_prototype():
+    """Copy handlers from the empty planner prototype (current GridManager.__init__)"""
+    return GridManager()
+
+
+def main():
+    from_prototype()  # build the prototype outside the timed section
+    for func in (from_scratch_cold, from_scratch_warm, from_prototype):
+        number = NUMBER // 20 if func is from_scratch_cold else NUMBER
+        seconds = timeit.timeit(func, number=number)
+        print(f"{func.__name__:<20} {seconds / number * 1e6:10.1f} us/session")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Benchmark persistence encode/decode cost, zip (parquet) vs binary snapshot
+
+Run from the repository root:
+    python -m benchmarks.bench_snapshot_codec
+"""
+
+import timeit
+from src.backend.internal.grid_manager import GridManager
+from benchmarks._fixtures import build_manager
+
+NUMBER = 200
+
+
+def main():
+    manager = build_manager()
+    codecs = {
+        "zip": (manager.serialise_to_zip, GridManager.deserialise_from_zip),
+        "snapshot": (
+            manager.serialise_to_snapshot,
+            GridManager.deserialise_from_snapshot,
+        ),
+    }
+    print(f"{'format':<10} {'bytes':>8} {'encode':>12} {'decode':>12}")
+    for name, (encode, decode) in codecs.items():
+        data = encode()
+        encode_us = timeit.timeit(encode, number=NUMBER) / NUMBER * 1e6
+        decode_us = timeit.timeit(lambda: decode(data), number=NUMBER) / NUMBER * 1e6
+        print(f"{name:<10} {len(data):>8} {encode_us:9.1f} us {decode_us:9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
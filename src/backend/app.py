@@ -14,6 +14,7 @@ from google.cloud.firestore import Client
 from google.cloud.firestore import FieldFilter
 from src.backend.config import config
 from src.backend.internal.lru_cache import CustomLRUCache
+from src.backend.internal.event_bus import SessionEventBus
 from src.backend.routers import health, planner
 
 from fastapi.exceptions import RequestValidationError
@@ -188,6 +189,7 @@ async def lifespan(app: FastAPI):
 
 def create_app(use_lifespan: bool = True):
     app = FastAPI(lifespan=lifespan if use_lifespan else None)
+    app.state.event_bus = SessionEventBus()  # per session pub/sub for /events/
     app.include_router(health.router)
     app.include_router(planner.router)
     return app
@@ -203,6 +205,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],  # read by the frontend for conditional requests
 )
 
 
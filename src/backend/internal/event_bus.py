@@ -0,0 +1,76 @@
+"""
+In-process pub/sub of planner mutation events, one topic per session
+
+Mutation endpoints publish their deltas here and every open /events/ stream of the same
+session_id receives them, keeping multiple tabs or devices current without polling.
+Events are encoded once per publish as a Server-Sent Events frame shared by all subscribers.
+"""
+
+import asyncio
+import logging
+from src.backend.internal.json_encoder import encode_json
+
+REFRESH_FRAME = b'data: {"type":"refresh"}\n\n'
+
+
+def encode_event(event: dict) -> bytes:
+    """
+    Encode an event as a Server-Sent Events frame
+    """
+    return b"data: " + encode_json(event) + b"\n\n"
+
+
+class SessionEventBus:
+    def __init__(self, max_queue_size: int = 100):
+        """
+        Args:
+            max_queue_size (int): frames buffered per subscriber before it is told to refresh
+        """
+        self.max_queue_size = max_queue_size
+        self.subscribers: dict[str, set[asyncio.Queue]] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def subscribe(self, session_id: str) -> asyncio.Queue:
+        """
+        Returns a new queue receiving the encoded events of a session
+        """
+        queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self.subscribers.setdefault(session_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, session_id: str, queue: asyncio.Queue):
+        queues = self.subscribers.get(session_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self.subscribers[session_id]
+
+    def num_subscribers(self, session_id: str) -> int:
+        return len(self.subscribers.get(session_id, ()))
+
+    def publish(self, session_id: str, event: dict) -> int:
+        """
+        Publish an event to every subscriber of a session
+        - A subscriber that fell behind has its buffered events replaced by a refresh
+          event, telling the client to refetch instead of patching
+
+        Args:
+            session_id (str): session the event belongs to
+            event (dict): JSON serialisable event, {"type": ..., ...}
+        Returns:
+            int: number of subscribers the event was sent to
+        """
+        queues = self.subscribers.get(session_id)
+        if not queues:
+            return 0
+        frame = encode_event(event)
+        for queue in queues:
+            if queue.full():
+                self.logger.debug("Subscriber of %s fell behind", session_id)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(REFRESH_FRAME)
+            else:
+                queue.put_nowait(frame)
+        return len(queues)
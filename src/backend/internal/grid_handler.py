@@ -1,10 +1,87 @@
 import io
+import functools
+from pathlib import Path
+from types import MappingProxyType
 import pandas as pd
 import numpy as np
 from typing import Literal
 import logging
 from bitarray import bitarray
 import src.backend.internal.time_blocks as tb
+from src.backend.internal.json_encoder import encode_json
+from src.backend.internal.shift_matrix import (
+    ShiftMatrix,
+    LOCATION_CODES,
+    LOCATION_TO_CODE,
+    EMPTY_CODE,
+    encode,
+    decode,
+)
+
+TEMPLATE_PATH = Path(__file__).parent / "raw.csv"
+
+
+@functools.cache
+def get_grid_template() -> MappingProxyType:
+    """
+    Parse the raw grid template once per process
+
+    Returns:
+        MappingProxyType: read only mapping of day -> tuple of time blocks for that day
+    """
+    df = pd.read_csv(TEMPLATE_PATH)
+    template = {
+        int(day): tuple(times.tolist()) for day, times in df.groupby("DAY")["Time"]
+    }
+    return MappingProxyType(template)
+
+
+def build_column_defs(
+    day: int, location: str, fields: tuple[str, ...], compressed: bool = False
+) -> list[dict]:
+    """
+    Build the aggrid columnDefs of a grid
+    - columnDefs only depend on the day, location and displayed time blocks, not on the names
+
+    Args:
+        day (int): day of the grid
+        location (str): location of the grid
+        fields (tuple[str, ...]): displayed time blocks
+        compressed (bool): build the compressed night duty columnDefs
+    Returns:
+        list[dict]: aggrid columnDefs
+    """
+    if compressed:
+        children = [{"headerName": field, "field": field} for field in fields]
+        return [
+            {
+                "headerName": "Night Duty",
+                "headerClass": "center-header",
+                "children": GridHandler._style_columns_compressed(children),
+            }
+        ]
+
+    first_field = f"DAY{day}:{location}"
+    column_defs = [{"headerName": first_field, "field": first_field}]
+    column_defs.extend({"headerName": field, "field": field} for field in fields)
+    if day == 3:
+        column_defs[0]["headerName"] = "NIGHT DUTY"
+    return GridHandler._style_columns(column_defs)
+
+
+@functools.lru_cache(maxsize=256)
+def get_encoded_column_defs(
+    day: int, location: str, fields: tuple[str, ...], compressed: bool = False
+) -> bytes:
+    """
+    JSON encoded columnDefs, memoized per process and shared by every session
+    - Only a handful of (day, location, displayed blocks) combinations exist, so
+      rendering a grid only has to encode its rowData
+
+    Returns:
+        bytes: columnDefs encoded the same way as encode_json
+    """
+    return encode_json(build_column_defs(day, location, fields, compressed))
 
 
 class GridHandler:
@@ -26,10 +103,38 @@ class GridHandler:
         self.location = location
         self.day = day
         self.identifier = f"{self.day},{self.location} GridHandler"
+        self.grid_key = f"DAY{self.day}:{self.location}"  # key in GridManager.all_grids
         self.logger = logging.getLogger(__name__)
         self.hours = {}  # stores hour data in name:hour format
+        self.version = 0  # incremented on every mutation of the grid
+        self.render_cache = {}  # rendered payloads, see render_aggrid
+        self.journal = None  # operation journal shared with the owning GridManager
         self.load_data()
-        self.bit_mask = self.create_bit_mask(len(self.data) // 2)
+        self.bit_mask = self.create_bit_mask(len(self.times) // 2)
+
+    def copy(self) -> "GridHandler":
+        """
+        Create an independent copy of this GridHandler without calling __init__
+        - The time blocks are immutable and shared with the copy
+
+        Returns:
+            GridHandler: copied instance
+        """
+        instance = GridHandler.__new__(GridHandler)
+        instance.names = self.names.copy()
+        instance.location = self.location
+        instance.day = self.day
+        instance.identifier = self.identifier
+        instance.grid_key = self.grid_key
+        instance.logger = self.logger
+        instance.hours = self.hours.copy()
+        instance.times = self.times
+        instance.grid = self.grid.copy()
+        instance.bit_mask = self.bit_mask.copy()
+        instance.version = 0
+        instance.render_cache = {}
+        instance.journal = None
+        return instance
 
     def equals(self, other: "GridHandler") -> tuple[bool, str | None]:
         """
@@ -56,18 +161,37 @@ class GridHandler:
             return False, "names"
         if not (self.bit_mask == other.bit_mask):
             return False, "bit_mask"
-        if not self.data.equals(other.data):
+        if not (self.times == other.times and self.grid.equals(other.grid)):
             return False, "dataframe"
         return True, None
 
+    @property
+    def data(self) -> pd.DataFrame:
+        """
+        DataFrame view of the grid with columns DAY, Time, followed by one column per name
+        - Built from the shift matrix on access, changes to it are not written back
+        """
+        data = {
+            "DAY": np.full(len(self.times), self.day, dtype=np.int64),
+            "Time": self.times,
+        }
+        decoded = decode(self.grid.view())
+        for idx, name in enumerate(self.grid.columns):
+            data[name] = decoded[:, idx]
+        return pd.DataFrame(data)
+
     def load_data(self):
         """
-        loads the raw format for the grid
+        loads the raw format for the grid from the shared template
         """
-        df = pd.read_csv("src/backend/internal/raw.csv")
-        df = df[df["DAY"] == self.day]
-        df = df.reset_index(drop=True)
-        self.data = df
+        self.times = get_grid_template()[self.day]  # immutable, shared across handlers
+        self.grid = ShiftMatrix(len(self.times))
+
+    def _row(self, time_block: str) -> int | None:
+        """
+        Returns the row index of a time block, None if it is not a valid time block
+        """
+        return tb.BLOCK_INDEX_MAP[self.day].get(time_block)
 
     def create_bit_mask(self, size: int):
         """
@@ -93,33 +217,33 @@ class GridHandler:
         Args:
             time_block (str): time_block to check e.g. "08:00","12:30"
         """
-        first_slot = None
-        second_slot = None
-        if ":30" in time_block:
-            second_slot = time_block
-            first_slot = time_block[:3] + "00"
-        else:
-            first_slot = time_block
-            second_slot = time_block[:3] + "30"
+        index = tb.PAIR_INDEX_MAP[self.day][time_block]
 
         bit_value = 1
-        if not self._check_can_join_block(first_slot, second_slot):
+        if not self._check_can_join_block(index):
             bit_value = 0
-        index = tb.HALF_DAY_BLOCK_MAP[self.day].index(second_slot)
         self._set_bit(index, bit_value)
 
-    def _check_can_join_block(self, first_slot: str, second_slot: str) -> bool:
+    def recompute_bit_mask(self):
+        """
+        Recompute every bit of the bit mask from the shift matrix in one vectorized pass
+        - Compares all ":00" rows against their ":30" rows at once
+        - Called after bulk changes (adding/removing a name, loading stored data)
         """
-        Checks if two specified time slots can be joined
+        codes = self.grid.view()
+        can_join = (codes[0::2] == codes[1::2]).all(axis=1)
+        mask = bitarray()
+        mask.pack(can_join.tobytes())
+        self.bit_mask = mask
+
+    def _check_can_join_block(self, pair_index: int) -> bool:
+        """
+        Checks if the two time slots of a 1h pair can be joined
         Args:
-            first_slot(str): First time slot ending with ":00"
-            second_slot(str): Second time slot ending with ":30"
+            pair_index(int): Index of the pair, rows 2 * pair_index (":00") and 2 * pair_index + 1 (":30")
         """
-        first_slot_data = self.data.loc[self.data.Time == first_slot].to_numpy()[0][2:]
-        second_slot_data = self.data.loc[self.data.Time == second_slot].to_numpy()[0][
-            2:
-        ]
-        return np.array_equal(first_slot_data, second_slot_data)
+        codes = self.grid.view()
+        return np.array_equal(codes[2 * pair_index], codes[2 * pair_index + 1])
 
     def _set_bit(self, idx: int, value: Literal[0, 1]):
         """
@@ -131,6 +255,16 @@ class GridHandler:
         """
         self.bit_mask[idx] = value
 
+    def _record(self, op: str, *args):
+        """
+        Append an applied operation to the journal, if this handler belongs to a GridManager
+        - Operations are kept until the next sync as (grid_key, op, *args) tuples that
+          reference strings the handler already holds, not per edit copies
+        - See GridManager.replay_journal for the operations
+        """
+        if self.journal is not None:
+            self.journal.append((self.grid_key, op, *args))
+
     def set_data(self, data):
         """
         Method is called when loading previously stored data
@@ -138,25 +272,26 @@ class GridHandler:
         data(pandas dataframe object):
             Previously stored dataframe
         """
-        self.data = data
-        self.names = set(data.columns[2:].tolist())
+        self.version += 1
+        self._record("set_data")  # not replayable, forces a full snapshot
+        self._load_dataframe(data)
+        self.recompute_bit_mask()
+        self.names = set(self.grid.columns)
         # update the hours
+        for c in self.grid.columns:
+            self.hours[c] = int(np.count_nonzero(self.grid.column(c))) * 0.5
 
-        if len(self.names) == 0:
-            pass
+    def _load_dataframe(self, data: pd.DataFrame):
+        """
+        Rebuild the time blocks and shift matrix from a DataFrame in the stored format
 
-        else:
-            for c in self.data.columns[2:]:  # for each column
-                total_hours = 0
-                freq = self.data[c].value_counts().to_dict()
-                if "MCC" in freq:
-                    total_hours += freq["MCC"] * 0.5
-                if "HCC1" in freq:
-                    total_hours += freq["HCC1"] * 0.5
-                if "HCC2" in freq:
-                    total_hours += freq["HCC2"] * 0.5
-
-                self.hours[c] = total_hours
+        Args:
+            data (pd.DataFrame): DataFrame with columns DAY, Time, followed by one column per name
+        """
+        self.times = tuple(data["Time"].tolist())
+        self.grid = ShiftMatrix(len(self.times), capacity=max(8, len(data.columns)))
+        for c in data.columns[2:]:  # for each column
+            self.grid.add_column(c, encode(data[c].tolist()))
 
     def get_names(self):
         return self.names.copy()
@@ -184,13 +319,14 @@ class GridHandler:
             )
             return
         self.names.add(upper_name)
+        self.version += 1
         if shifts == []:
-            self.data[upper_name] = ["0"] * len(
-                self.data.index
-            )  # each cell is 4 characters long
+            self.grid.add_column(upper_name)
         else:
-            self.data[upper_name] = shifts
+            self.grid.add_column(upper_name, encode(shifts))
+            self.recompute_bit_mask()
         self.hours[upper_name] = self._compute_hours(shifts)
+        self._record("add", upper_name, list(shifts))
 
     def _compute_hours(self, shifts: list):
         hours = 0
@@ -213,11 +349,13 @@ class GridHandler:
                 self.names,
             )
             return
-        d = self.data[upper_name].to_list()
-        self.data.drop(upper_name, axis=1, inplace=True)
+        d = decode(self.grid.remove_column(upper_name)).tolist()
+        self.version += 1
+        self.recompute_bit_mask()
         self.names.remove(upper_name)
         h = self.hours[name]
         del self.hours[name]
+        self._record("remove", upper_name)
         return {"data": d, "hours": h}
 
     def rename(self, new_name, old_name):
@@ -240,13 +378,15 @@ class GridHandler:
             return
 
         # update database column name
-        self.data = self.data.rename(columns={old_name: new_name})
+        self.grid.rename_column(old_name, new_name)
+        self.version += 1
 
         # update the name hour_count
         self.hours[new_name] = self.hours.pop(old_name)
         # update the name set
         self.names.remove(old_name)
         self.names.add(new_name)
+        self._record("rename", new_name, old_name)
 
     def swap_names(self, name1, name2) -> bool:
         """
@@ -264,11 +404,13 @@ class GridHandler:
         if name2 not in self.names:
             self.logger.info("%s:%s does not exist in grid", self.identifier, name2)
             return False
-        self.data = self.data.rename(columns={name1: name2, name2: name1})
+        self.grid.swap_columns(name1, name2)
+        self.version += 1
         self.hours[name1], self.hours[name2] = (
             self.hours[name2],
             self.hours[name1],
         )  # swap the hour count
+        self._record("swap", name1, name2)
         return True
 
     def is_shift_allocated(self, time_block, name) -> bool | None:
@@ -280,20 +422,20 @@ class GridHandler:
             name of person. Must already exist in column
         """
         name_upper = name.upper()
-        if name_upper not in self.data.columns:
+        if not self.grid.has_column(name_upper):
             self.logger.warning(
                 "%s:%s does not exist in the grid", self.identifier, name
             )
             return None
-        rows = self.data[self.data.Time == time_block]
-        if rows.empty:
+        row = self._row(time_block)
+        if row is None:
             self.logger.warning(
                 "%s:%s is not a valid time block", self.identifier, time_block
             )
             return None
-        return rows[name_upper].iloc[0] != "0"
+        return self.grid.get(row, name_upper) != EMPTY_CODE
 
-    def allocate_shift(self, location, time_block, name):
+    def allocate_shift(self, location, time_block, name, update_mask: bool = True):
         """
         Allocate a shift to a person at a specified time_block and location
 
@@ -304,65 +446,148 @@ class GridHandler:
                 str in "HH:MM" Format. In 30 min intervals
             name(str):
                 name of person. Must already exist in column
+            update_mask(bool):
+                Update the affected bit. Pass False for bulk changes followed by recompute_bit_mask
         """
+        # Single pass: resolve row and column once, then read, write and update the
+        # hours and the affected bit mask pair directly on the shift matrix.
+        name_upper = name.upper()
+        col = self.grid.column_index.get(name_upper)
+        if col is None:
+            self.logger.warning(
+                "%s:%s does not exist in the grid", self.identifier, name
+            )
+            return
+        row = self._row(time_block)
+        if row is None:
+            self.logger.warning(
+                "%s:%s is not a valid time block", self.identifier, time_block
+            )
+            return
+
+        # For day 3 location should be "MCC" or "0"
+        if self.day == 3 and location not in ["MCC", "0"]:
+            location = "MCC"  # default location for night duty
+        new_code = LOCATION_TO_CODE[location]
+        # journal the template's strings instead of holding on to the request's
+        self._record(
+            "allocate", LOCATION_CODES[new_code], self.times[row], self.grid.columns[col]
+        )
+
+        codes = self.grid.codes
+        current_code = codes[row, col]
+        if current_code == new_code:  # same location, deallocate
+            new_code = EMPTY_CODE
+
         # shift empty add hours
         # shift changing to "0" subtract hours
         # shift replacing to different location, keep hours change location
-        final_location, allocated = self._resolve_location(location, time_block, name)
-        if final_location is None:
+        if current_code == EMPTY_CODE and new_code != EMPTY_CODE:
+            self.hours[name_upper] += 0.5
+        elif current_code != EMPTY_CODE and new_code == EMPTY_CODE:
+            self.hours[name_upper] -= 0.5
+        self.grid.set(row, name_upper, new_code)
+        self.version += 1
+        if not update_mask:
             return
-        if not allocated:
-            self.hours[name] += 0.5
-        elif allocated and final_location == "0":
-            self.hours[name] -= 0.5
-        self.data.loc[(self.data.Time == time_block), name.upper()] = final_location
-        self.update_bit_mask(time_block)
 
-    def _resolve_location(
-        self, new_location: str, time_block: str, name: str
-    ) -> tuple[str | None, bool]:
-        """
-        Resolve the final location to allocate
-        - If location == current location, we deallocate
-        - If location != "0" we allocate
+        # recompute the bit of the pair this row belongs to
+        pair_index = row // 2
+        self._set_bit(pair_index, int(self._check_can_join_block(pair_index)))
+
+    def allocate_range(
+        self,
+        location: str,
+        start_block: str,
+        end_block: str,
+        name: str,
+        mode: Literal["set", "clear"] = "set",
+    ) -> bool:
+        """
+        Allocate or clear a contiguous span of time blocks for a person
+        - The span is inclusive and follows the order of the day's time blocks,
+          so day 3 ranges such as "21:00" to "06:30" wrap past midnight
+        - Unlike allocate_shift this does not toggle, "set" overwrites every block with location
 
         Args:
-            location(str): location to allocate
-            time_block(str): time block to allocate
-            name(str): name to allocate to
+            location(str): "MCC" or "HCC1" or "HCC2", ignored when clearing
+            start_block(str): first time block of the span e.g. "08:00"
+            end_block(str): last time block of the span e.g. "12:30"
+            name(str): name of person. Must already exist in column
+            mode(str): "set" to allocate location, "clear" to deallocate
 
         Returns:
-            - final allocation location(str)| (None) if there is internal error
-            - Whether current block is already allocated(bool)
+            True if the span was written else False
+        Raises:
+            ValueError: mode is not "set" or "clear"
         """
-        final_location = new_location
-        # check if shift is currently allocated
-        allocated = self.is_shift_allocated(time_block, name)
-        if allocated is None:
-            return None, False
-
-        # For day 3 location should be "MCC" or "0"
-        if self.day == 3 and new_location not in ["MCC", "0"]:
-            final_location = "MCC"  # default location for night duty
+        if mode not in ("set", "clear"):
+            raise ValueError(f"Invalid allocate_range mode: {mode}")
+        name_upper = name.upper()
+        col = self.grid.column_index.get(name_upper)
+        if col is None:
+            self.logger.warning(
+                "%s:%s does not exist in the grid", self.identifier, name
+            )
+            return False
+        start_row = self._row(start_block)
+        end_row = self._row(end_block)
+        if start_row is None or end_row is None or start_row > end_row:
+            self.logger.warning(
+                "%s:%s to %s is not a valid time range",
+                self.identifier,
+                start_block,
+                end_block,
+            )
+            return False
 
-        # get the current location
-        current_location = self.get_shift_location(time_block, name)
-        if current_location is None:
-            return None, False
+        if mode == "set":
+            # For day 3 location should be "MCC"
+            if self.day == 3:
+                location = "MCC"  # default location for night duty
+            new_code = LOCATION_TO_CODE[location]
+        elif mode == "clear":
+            new_code = EMPTY_CODE
+
+        span_length = end_row + 1 - start_row
+        allocated_before = int(
+            np.count_nonzero(self.grid.codes[start_row : end_row + 1, col])
+        )
+        self.grid.set_span(start_row, end_row, name_upper, new_code)
+        self.version += 1
+        allocated_after = span_length if new_code != EMPTY_CODE else 0
+        self.hours[name_upper] += (allocated_after - allocated_before) * 0.5
+        self._record(
+            "range",
+            LOCATION_CODES[new_code],
+            self.times[start_row],
+            self.times[end_row],
+            self.grid.columns[col],
+            mode,
+        )
 
-        if current_location == final_location:
-            final_location = "0"
-        return final_location, allocated
+        # recompute only the bits of the pairs the span touches
+        first_pair = start_row // 2
+        last_pair = end_row // 2
+        codes = self.grid.view()[2 * first_pair : 2 * last_pair + 2]
+        can_join = (codes[0::2] == codes[1::2]).all(axis=1)
+        for offset, value in enumerate(can_join.tolist()):
+            self._set_bit(first_pair + offset, int(value))
+        return True
 
     def remove_shift(self, time_block, name):
         """
+        Deallocate a single time block, a one block "clear" through allocate_range
+        so hours, bit mask and journal stay in step
+
         time_block(str):
             str in "HH:MM" Format. In 30 min intervals
         name(str):
             name of person. Must already exist in column
+        Returns:
+            True if the time block was cleared else False
         """
-        self.data.loc[(self.data.Time == time_block), name.upper()] = "0"
-        self.hours[name] -= 0.5
+        return self.allocate_range(self.location, time_block, time_block, name, "clear")
 
     def get_shift_location(self, time_block, name):
         """
@@ -372,49 +597,99 @@ class GridHandler:
             name of person. Must already exist in column
         """
         name_upper = name.upper()
-        if name_upper not in self.data.columns:
+        if not self.grid.has_column(name_upper):
             self.logger.warning(
                 "%s:%s does not exist in the grid", self.identifier, name
             )
             return None
-        rows = self.data[self.data.Time == time_block]
-        if rows.empty:
+        row = self._row(time_block)
+        if row is None:
             self.logger.warning(
                 "%s:%s is not a valid time block", self.identifier, time_block
             )
             return None
 
-        return rows[name_upper].iloc[0]
+        return LOCATION_CODES[self.grid.get(row, name_upper)]
 
     def check_lunch_and_dinner(self):
         """
         Returns names of people who do not have a lunch or dinner break
+        - A name allocated in every time block of a window in tb.BREAK_ROW_WINDOWS has no break
+        - Only checks this grid, see GridManager.check_breaks for all locations of a day
         """
-        # checks if someone has no lunch/dinner break.
-        # names will be returned in an array
-
-        # lunch  = 1130-1330 >> I.e. cannot start from 1100 and end at 1330 without break
-        # dinner = 1700-1830 >> cannot start at 1700 and end at 1830 without break
         result = set()  # stores names who don't have breaks
-        lunch = self.data[
-            (self.data["Time"] >= "11:00") & (self.data["Time"] <= "13:00")
-        ]
-        dinner = self.data[
-            (self.data["Time"] >= "17:00") & (self.data["Time"] <= "18:00")
-        ]
+        allocated = self.grid.view() != EMPTY_CODE
+        for start, end in tb.BREAK_ROW_WINDOWS[self.day].values():
+            no_break = allocated[start : end + 1].all(axis=0)
+            result.update(self.grid.columns[idx] for idx in np.flatnonzero(no_break))
+        return result
 
-        for c in lunch.columns[2:]:  # check lunch
-            if "0" not in lunch[c].array:
-                result.add(c)
-        for c in dinner.columns[2:]:  # check dinner
-            if c not in result and "0" not in dinner[c].array:
-                result.add(c)
+    def render_aggrid(
+        self, blocks_to_remove: list[str], compressed: bool = False
+    ) -> bytes:
+        """
+        Render the grid as JSON bytes ({"data": aggrid format}) for the /grid/ endpoints
+        - Payloads are cached per (format, version, blocks_to_remove)
+        - Any mutation bumps self.version which invalidates the cached payload
+        - columnDefs come pre-encoded from get_encoded_column_defs, only rowData is encoded
 
-        return result
+        Args:
+            blocks_to_remove (list[str]): half blocks that are joined for this day
+            compressed (bool): render the compressed night duty format
+        Returns:
+            bytes: JSON encoded payload
+        """
+        key = (self.version, tuple(blocks_to_remove))
+        cached = self.render_cache.get(compressed)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        rows = self._visible_rows(blocks_to_remove)
+        fields = tuple(self.times[idx] for idx in rows)
+        if compressed:
+            row_data = self._compressed_row_data(rows)
+        else:
+            row_data = self._aggrid_row_data(rows)
+        column_defs = get_encoded_column_defs(
+            self.day, self.location, fields, compressed
+        )
+        # splice the memoized columnDefs in, same bytes as encode_json({"data": ...})
+        body = b"".join(
+            (
+                b'{"data":{"columnDefs":',
+                column_defs,
+                b',"rowData":',
+                encode_json(row_data),
+                b"}}",
+            )
+        )
+        self.render_cache[compressed] = (key, body)
+        return body
+
+    def render_aggrid_data(
+        self, blocks_to_remove: list[str], compressed: bool = False
+    ) -> bytes:
+        """
+        The JSON encoded aggrid format on its own, without the {"data": ...} wrapper
+        - Sliced out of the cached render_aggrid payload, used to nest grids in larger payloads
+
+        Returns:
+            bytes: JSON encoded {"columnDefs": ..., "rowData": ...}
+        """
+        body = self.render_aggrid(blocks_to_remove, compressed)
+        return body[len(b'{"data":') : -1]
+
+    def _visible_rows(self, blocks_to_remove: list[str]) -> list[int]:
+        """
+        Returns the row indices of the time blocks that are displayed
+        """
+        removed = set(blocks_to_remove)
+        return [idx for idx, block in enumerate(self.times) if block not in removed]
 
     def generate_formatted_dataframe(self, blocks_to_remove):
         """
         Formats the dataframe to the required format for the front end, including the 1h time blocks that can be joined
+        - Original DataFrame render path, kept as the reference render_aggrid is tested against
         """
         data = self.data.copy()
         data = data.drop(columns=["DAY"])
@@ -500,7 +775,56 @@ class GridHandler:
 
         return {"columnDefs": [column_defs], "rowData": formatted_row_data}
 
-    def _style_columns_compressed(self, column_defs: list[dict]) -> list[dict]:
+    def _aggrid_row_data(self, rows: list[int]) -> list[dict]:
+        """
+        One aggrid row per name holding its location in each displayed time block
+
+        Args:
+            rows (list[int]): row indices of the displayed time blocks
+        """
+        first_field = f"DAY{self.day}:{self.location}"
+        fields = [self.times[idx] for idx in rows]
+        # one list of locations per name, in column order
+        name_locations = decode(self.grid.view()[rows].T).tolist()
+        row_data = []
+        for name, locations in zip(self.grid.columns, name_locations):
+            row = {first_field: name}
+            row.update(zip(fields, locations))
+            row_data.append(row)
+        return row_data
+
+    def _compressed_col_data(self, rows: list[int]) -> dict:
+        """
+        Names allocated under each displayed time block, in column order
+        - One np.nonzero pass over the displayed rows, results are cached by render_aggrid
+        """
+        fields = [self.times[idx] for idx in rows]
+        col_data = {field: [] for field in fields}
+        names = self.grid.columns
+        # nonzero is row major, so each time block lists its names in column order
+        allocated_rows, allocated_cols = np.nonzero(self.grid.view()[rows])
+        for row, col in zip(allocated_rows.tolist(), allocated_cols.tolist()):
+            col_data[fields[row]].append(names[col])
+        return col_data
+
+    def _compressed_row_data(self, rows: list[int]) -> list[dict]:
+        return self._compressed_rows(self._compressed_col_data(rows))
+
+    @staticmethod
+    def _compressed_rows(col_data: dict) -> list[dict]:
+        """
+        Lay out the names allocated under each time column as compressed aggrid rows
+        - Row i holds the i-th name of every column, "0" where a column has fewer names
+        """
+        num_rows = max((len(names) for names in col_data.values()), default=0)
+        formatted_row_data = [{} for _ in range(num_rows)]
+        for field, names in col_data.items():
+            for i, row in enumerate(formatted_row_data):
+                row[field] = names[i] if i < len(names) else "0"
+        return formatted_row_data
+
+    @staticmethod
+    def _style_columns_compressed(column_defs: list[dict]) -> list[dict]:
         """
         Inject data into column definitions for styling. (For compressed grid)
         """
@@ -514,7 +838,8 @@ class GridHandler:
             data["cellClassRules"] = cell_class_rules
         return column_defs
 
-    def _style_columns(self, column_defs: list[dict]) -> list[dict]:
+    @staticmethod
+    def _style_columns(column_defs: list[dict]) -> list[dict]:
         """
         Inject data into column definitions for styling
         """
@@ -529,6 +854,55 @@ class GridHandler:
             data["sortable"] = False
         return column_defs
 
+    def serialise_to_snapshot(self) -> tuple[dict, bytes]:
+        """
+        Serialise GridHandler instance for the binary snapshot format, see GridManager
+
+        Returns:
+            Tuple containing:
+                - metadata (dict): location, day, names in column order and their hours
+                - codes (bytes): (time blocks x names) uint8 location codes in row major order
+        """
+        names = self.grid.columns
+        metadata = {
+            "location": self.location,
+            "day": self.day,
+            "names": names,
+            "hours": [self.hours.get(name, 0) for name in names],
+        }
+        return metadata, np.ascontiguousarray(self.grid.view()).tobytes()
+
+    @classmethod
+    def deserialise_from_snapshot(
+        cls, metadata: dict, codes: np.ndarray
+    ) -> "GridHandler":
+        """
+        Reconstruct GridHandler instance from a snapshot, without pandas or pyarrow
+
+        Args:
+            metadata: Dictionary from serialise_to_snapshot
+            codes: (time blocks x names) uint8 location codes
+        Returns:
+            GridHandler: Reconstructed instance
+        """
+        instance = cls.__new__(cls)
+        names = metadata["names"]
+        instance.names = set(names)
+        instance.location = metadata["location"]
+        instance.day = metadata["day"]
+        instance.identifier = f"{instance.day},{instance.location} GridHandler"
+        instance.grid_key = f"DAY{instance.day}:{instance.location}"
+        instance.logger = logging.getLogger(__name__)
+        instance.hours = dict(zip(names, metadata["hours"]))
+        instance.version = 0
+        instance.render_cache = {}
+        instance.journal = None
+        instance.times = get_grid_template()[instance.day]
+        instance.grid = ShiftMatrix.from_codes(codes, names)
+        # derived from the grid, the same as deserialise_from_storage
+        instance.recompute_bit_mask()
+        return instance
+
     def serialise_for_storage(self):
         """
         Serialise GridHandler instance for storage.
@@ -576,13 +950,24 @@ class GridHandler:
         instance.location = metadata["location"]
         instance.day = metadata["day"]
         instance.identifier = metadata["identifier"]
+        instance.grid_key = f"DAY{instance.day}:{instance.location}"
         instance.hours = metadata["hours"]
-        instance.bit_mask = bitarray(metadata["bit_mask"])
-
-        # Set the DataFrame
-        instance.data = dataframe
+        instance.version = 0
+        instance.render_cache = {}
+        instance.journal = None
 
         # Recreate logger (shouldn't be serialized)
         instance.logger = logging.getLogger(__name__)
 
+        # Rebuild the shift matrix from the DataFrame
+        instance._load_dataframe(dataframe)
+
+        # The bit mask is derived from the grid instead of trusting the stored copy
+        instance.recompute_bit_mask()
+        if instance.bit_mask.to01() != metadata.get("bit_mask"):
+            instance.logger.warning(
+                "%s:Stored bit mask does not match grid, rebuilt from data",
+                instance.identifier,
+            )
+
         return instance
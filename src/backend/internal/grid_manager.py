@@ -1,10 +1,148 @@
 import io
 import zipfile
 import json
+import functools
+import uuid
+import struct
+import orjson
+from collections import Counter
+from collections.abc import MutableMapping
+from types import MappingProxyType
+import numpy as np
 from bitarray import bitarray
 from typing import cast
 import logging
-from src.backend.internal.grid_handler import GridHandler
+from src.backend.internal.grid_handler import GridHandler, get_grid_template
+from src.backend.internal.json_encoder import encode_json
+from src.backend.internal.shift_matrix import EMPTY_CODE, decode
+import src.backend.internal.time_blocks as tb
+
+
+SNAPSHOT_MAGIC = b"NSPS"
+SNAPSHOT_VERSION = 1
+# magic, format version, length of the JSON manifest
+SNAPSHOT_HEADER = struct.Struct("<4sBI")
+
+# journal operations GridManager.replay_journal can apply
+REPLAYABLE_OPERATIONS = {"add", "remove", "rename", "swap", "allocate", "range"}
+# stored journal length past which the next sync writes a new snapshot instead
+JOURNAL_COMPACTION_THRESHOLD = 500
+
+
+class PendingGrid:
+    """
+    A serialised GridHandler kept as stored until it is first accessed, see LazyGrids
+    """
+
+    __slots__ = ("format", "metadata", "payload", "loader")
+
+    def __init__(self, format: str, metadata: dict, payload, loader):
+        """
+        Args:
+            format (str): "snapshot" or "zip", the format the payload comes from
+            metadata (dict): handler metadata, holds the names of the grid
+            payload: location codes (snapshot) or parquet bytes (zip)
+            loader: callable(metadata, payload) -> GridHandler
+        """
+        self.format = format
+        self.metadata = metadata
+        self.payload = payload
+        self.loader = loader
+
+    @property
+    def names(self) -> list[str]:
+        return self.metadata["names"]
+
+    def load(self) -> GridHandler:
+        return self.loader(self.metadata, self.payload)
+
+
+class LazyGrids(MutableMapping):
+    """
+    Ordered mapping of grid key -> GridHandler used for GridManager.all_grids
+    - Values can be PendingGrids, deserialised transparently on first access
+    - Handlers deserialised on access get the journal of the owning GridManager
+    """
+
+    def __init__(self):
+        self._grids: dict[str, GridHandler | PendingGrid] = {}
+        self.journal: list | None = None
+
+    def __getitem__(self, key: str) -> GridHandler:
+        grid = self._grids[key]
+        if isinstance(grid, PendingGrid):
+            grid = grid.load()
+            grid.journal = self.journal
+            self._grids[key] = grid
+        return grid
+
+    def __setitem__(self, key: str, handler: GridHandler):
+        self._grids[key] = handler
+
+    def __delitem__(self, key: str):
+        del self._grids[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._grids
+
+    def __iter__(self):
+        return iter(self._grids)
+
+    def __len__(self) -> int:
+        return len(self._grids)
+
+    def peek(self, key: str) -> GridHandler | PendingGrid:
+        """
+        Returns the handler, or the PendingGrid if it has not been deserialised yet
+        """
+        return self._grids[key]
+
+    def loaded(self) -> list[GridHandler]:
+        return [
+            grid for grid in self._grids.values() if not isinstance(grid, PendingGrid)
+        ]
+
+
+def build_grid_handlers() -> dict[str, GridHandler]:
+    """
+    Build a new set of empty GridHandler instances, one for each grid in the planner
+
+    Returns:
+        dict[str, GridHandler]: grid key (e.g. "DAY1:MCC") -> GridHandler
+    """
+    all_grids = {}
+    all_locations = ["MCC", "HCC1", "HCC2"]
+    for location in all_locations:
+        for i in range(1, 4):
+            if i == 3 and location != "MCC":
+                continue
+            all_grids[f"DAY{i}:{location}"] = GridHandler(location=location, day=i)
+    return all_grids
+
+
+@functools.cache
+def get_empty_planner() -> MappingProxyType:
+    """
+    Prototype of an empty planner, built once per process
+    - New GridManagers copy their handlers from here instead of building them from scratch
+    - The prototype handlers are never handed out and must not be mutated
+
+    Returns:
+        MappingProxyType: read only mapping of grid key -> empty GridHandler
+    """
+    all_grids = build_grid_handlers()
+    for handler in all_grids.values():
+        handler.grid.codes.setflags(write=False)
+    return MappingProxyType(all_grids)
+
+
+def _load_snapshot_grid(metadata: dict, payload) -> GridHandler:
+    """
+    PendingGrid loader for the location codes of a snapshot
+    """
+    shape = (len(get_grid_template()[metadata["day"]]), len(metadata["names"]))
+    codes = np.frombuffer(payload, dtype=np.uint8).reshape(shape)
+    return GridHandler.deserialise_from_snapshot(metadata, codes)
 
 
 class GridManager:
@@ -14,9 +152,18 @@ class GridManager:
 
     def __init__(self):
         self.requires_sync = True
-        self.all_grids = {}
+        # unique per instance so ETags never match across resets/restores
+        self.epoch = uuid.uuid4().hex[:12]
+        self.hours_version = 0  # incremented whenever all_hours changes
+        self.break_cache = {}  # day -> (handler versions, check_breaks result)
+        self.all_grids = LazyGrids()
         self.setup_grid_handlers()
+        self._init_journal()
         self.existing_names = {"DAY1": set(), "DAY2": set(), "DAY3": set()}
+        # number of grids each name appears in per day, kept in sync with existing_names
+        self.name_counts = {"DAY1": Counter(), "DAY2": Counter(), "DAY3": Counter()}
+        # reverse index of name -> grid keys the name appears in
+        self.name_grids: dict[str, set[str]] = {}
         self.all_hours = {
             "TOTAL": {
                 "Name": "TOTAL",
@@ -32,15 +179,10 @@ class GridManager:
         Set up required grid_handler class instances
 
         This method is called automatically upon class instantiation
+        - Handlers are copied from the shared empty planner prototype
         """
-        all_locations = ["MCC", "HCC1", "HCC2"]
-        for location in all_locations:
-            for i in range(1, 4):
-                if i == 3 and location != "MCC":
-                    continue
-                self.all_grids[f"DAY{i}:{location}"] = GridHandler(
-                    location=location, day=i
-                )
+        for key, handler in get_empty_planner().items():
+            self.all_grids[key] = handler.copy()
 
     def format_keys(
         self,
@@ -81,6 +223,62 @@ class GridManager:
 
         return blocks_to_remove
 
+    def get_blocks_to_remove(self, day: int) -> list[str]:
+        """
+        Returns the half blocks ("xx:30") that can be joined across every grid of a day
+
+        Args:
+            day (int): Which day to format
+        """
+        bit_masks = {}
+        for handler in self.get_day_grids(day).values():
+            num = len(bit_masks) + 1
+            bit_masks[f"bit_mask_{num}"] = handler.bit_mask
+        return self.format_keys(tb.HALF_DAY_BLOCK_MAP[day], **bit_masks)
+
+    def get_day_grids(self, day: int) -> dict[str, GridHandler]:
+        """
+        Returns grid key -> GridHandler for the grids of a day
+        - Only the day's grids are deserialised if the manager was restored lazily
+        """
+        prefix = f"DAY{day}:"
+        return {
+            key: self.all_grids[key] for key in self.all_grids if key.startswith(prefix)
+        }
+
+    def grid_etag(self, day: int, location: str, compressed: bool = False) -> str:
+        """
+        ETag for a rendered grid
+        - The payload depends on the grid and on the bit masks of every grid of that day,
+          so the versions of all the day's handlers are included
+
+        Args:
+            day (int): day of the grid
+            location (str): location of the grid
+            compressed (bool): whether the compressed format is requested
+        """
+        versions = ".".join(
+            str(handler.version) for handler in self.get_day_grids(day).values()
+        )
+        kind = "c" if compressed else "g"
+        return f'"{self.epoch}-{kind}{day}{location}-{versions}"'
+
+    def day_etag(self, day: int, compressed: bool = False) -> str:
+        """
+        ETag for the whole day payload, every grid of the day and the hours
+        """
+        versions = ".".join(
+            str(handler.version) for handler in self.get_day_grids(day).values()
+        )
+        kind = "c" if compressed else "d"
+        return f'"{self.epoch}-{kind}{day}-{versions}-h{self.hours_version}"'
+
+    def hours_etag(self) -> str:
+        """
+        ETag for the hours table
+        """
+        return f'"{self.epoch}-h-{self.hours_version}"'
+
     def update_existing_names(self, day: int):
         """
         update the self.existing name attribute for a specified day
@@ -90,11 +288,208 @@ class GridManager:
         Args:
             day (int): Which day to update
         """
-        new_set = set()
-        for key, grid_handler in self.all_grids.items():
-            if f"DAY{day}" in key:
-                new_set = new_set.union(grid_handler.get_names())
-        self.existing_names[f"DAY{day}"] = new_set
+        day_key = f"DAY{day}"
+        # drop this day's grids from the reverse index before rebuilding it
+        for name in list(self.name_grids):
+            grids = self.name_grids[name]
+            grids.difference_update([key for key in grids if day_key in key])
+            if not grids:
+                del self.name_grids[name]
+
+        counts = Counter()
+        for key, grid_handler in self.get_day_grids(day).items():
+            counts.update(grid_handler.names)
+            for name in grid_handler.names:
+                self.name_grids.setdefault(name, set()).add(key)
+        self.name_counts[day_key] = counts
+        self.existing_names[day_key] = set(counts)
+
+    def add_name(self, name: str, target_grid: str) -> bool:
+        """
+        Add a name to a grid and incrementally update existing_names for that day
+
+        Args:
+            name (str): name to add, formatted to upper case
+            target_grid (str): grid key e.g. "DAY1:MCC"
+        Returns:
+            True if the name was added else False
+        """
+        name = name.upper()
+        handler = cast(GridHandler, self.all_grids[target_grid])
+        if handler.name_exists(name):
+            return False
+        handler.add_name(name)
+        self._track_added_name(name, target_grid, handler.day)
+        return True
+
+    def remove_name(self, name: str, target_grid: str) -> dict | None:
+        """
+        Remove a name from a grid and incrementally update existing_names for that day
+
+        Args:
+            name (str): name to remove, formatted to upper case
+            target_grid (str): grid key e.g. "DAY1:MCC"
+        Returns:
+            The removed data from GridHandler.remove_name, None if name does not exist
+        """
+        name = name.upper()
+        handler = cast(GridHandler, self.all_grids[target_grid])
+        if not handler.name_exists(name):
+            return None
+        removed = handler.remove_name(name)
+        self._track_removed_name(name, target_grid, handler.day)
+        return removed
+
+    def rename_name(self, new_name: str, old_name: str, target_grid: str) -> bool:
+        """
+        Rename a name in a grid and keep the name tracking in sync
+
+        Args:
+            new_name (str): new name, must not exist in the grid
+            old_name (str): existing name in the grid
+            target_grid (str): grid key e.g. "DAY1:MCC"
+        Returns:
+            True if the name was renamed else False
+        """
+        handler = cast(GridHandler, self.all_grids[target_grid])
+        if handler.name_exists(new_name) or not handler.name_exists(old_name):
+            handler.rename(new_name, old_name)  # logs the reason
+            return False
+        handler.rename(new_name, old_name)
+        self._track_removed_name(old_name, target_grid, handler.day)
+        self._track_added_name(new_name, target_grid, handler.day)
+        return True
+
+    def swap_names(self, name1: str, name2: str, target_grid: str) -> bool:
+        """
+        Swap two names in a grid. Both names stay in the grid so name tracking is unchanged
+
+        Returns:
+            True on successful swap else False
+        """
+        handler = cast(GridHandler, self.all_grids[target_grid])
+        return handler.swap_names(name1, name2)
+
+    def snapshot(self, target_grid: str, names: list[str]) -> dict:
+        """
+        Capture the state a mutation of some names in a grid can change, see delta
+
+        Args:
+            target_grid (str): grid key e.g. "DAY1:MCC"
+            names (list[str]): names the mutation touches
+        """
+        handler = cast(GridHandler, self.all_grids[target_grid])
+        columns = {}
+        for name in names:
+            if handler.grid.has_column(name):
+                columns[name] = handler.grid.column(name).copy()
+        return {
+            "target_grid": target_grid,
+            "names": list(names),
+            "blocks_to_remove": self.get_blocks_to_remove(handler.day),
+            "columns": columns,
+            "hours": {
+                name: self.all_hours[name].copy()
+                for name in [*names, "TOTAL"]
+                if name in self.all_hours
+            },
+        }
+
+    def delta(self, snapshot: dict) -> dict:
+        """
+        Compare the current state with a snapshot taken before a mutation
+        - Lets the client patch its grid and hours tables without refetching them
+
+        Returns:
+            dict: {
+                "target_grid": grid key,
+                "cells": [{"name", "time_block", "location"}, ...] changed cells,
+                "added_names" / "removed_names": names added to / removed from the grid,
+                "shown_blocks" / "hidden_blocks": half blocks of the day that are now
+                    displayed / joined, for every grid of the day,
+                "hours": changed hour rows, "removed_hours": names without an hour row
+            }
+        """
+        target_grid = snapshot["target_grid"]
+        handler = cast(GridHandler, self.all_grids[target_grid])
+        before_columns = snapshot["columns"]
+
+        cells = []
+        added_names = []
+        removed_names = [
+            name for name in before_columns if not handler.grid.has_column(name)
+        ]
+        for name in snapshot["names"]:
+            if not handler.grid.has_column(name):
+                continue
+            after = handler.grid.column(name)
+            before = before_columns.get(name)
+            if before is None:
+                added_names.append(name)
+                before = np.full_like(after, EMPTY_CODE)
+            rows = np.flatnonzero(before != after)
+            locations = decode(after[rows]).tolist()
+            for row, location in zip(rows.tolist(), locations):
+                time_block = handler.times[row]
+                cells.append(
+                    {"name": name, "time_block": time_block, "location": location}
+                )
+
+        before_blocks = snapshot["blocks_to_remove"]
+        after_blocks = self.get_blocks_to_remove(handler.day)
+        before_set, after_set = set(before_blocks), set(after_blocks)
+        hours = []
+        removed_hours = []
+        for name in dict.fromkeys([*snapshot["names"], "TOTAL"]):
+            before_hours = snapshot["hours"].get(name)
+            after_hours = self.all_hours.get(name)
+            if after_hours is None:
+                if before_hours is not None:
+                    removed_hours.append(name)
+            elif after_hours != before_hours:
+                hours.append(after_hours.copy())
+
+        return {
+            "target_grid": target_grid,
+            "cells": cells,
+            "added_names": added_names,
+            "removed_names": removed_names,
+            "shown_blocks": [
+                block for block in before_blocks if block not in after_set
+            ],
+            "hidden_blocks": [
+                block for block in after_blocks if block not in before_set
+            ],
+            "hours": hours,
+            "removed_hours": removed_hours,
+        }
+
+    def get_name_grids(self, name: str) -> set[str]:
+        """
+        Returns the grid keys a name appears in
+        """
+        return self.name_grids.get(name, set()).copy()
+
+    def _track_added_name(self, name: str, target_grid: str, day: int):
+        key = f"DAY{day}"
+        counts = self.name_counts[key]
+        counts[name] += 1
+        if counts[name] == 1:
+            self.existing_names[key].add(name)
+        self.name_grids.setdefault(name, set()).add(target_grid)
+
+    def _track_removed_name(self, name: str, target_grid: str, day: int):
+        key = f"DAY{day}"
+        counts = self.name_counts[key]
+        counts[name] -= 1
+        if counts[name] <= 0:
+            del counts[name]
+            self.existing_names[key].discard(name)
+        grids = self.name_grids.get(name)
+        if grids is not None:
+            grids.discard(target_grid)
+            if not grids:
+                del self.name_grids[name]
 
     def name_exists(self, name, day: int) -> bool:
         """
@@ -120,6 +515,70 @@ class GridManager:
 
         return row_data, pinned_row_data
 
+    def check_breaks(self, day: int) -> dict:
+        """
+        Find the names without a lunch or dinner break on a day
+        - Allocations of every location are combined, so a name split across MCC and
+          HCC1 over a whole window has no break either
+        - Results are cached until a grid of the day changes
+
+        Args:
+            day (int): which day
+        Returns:
+            dict: {"day": day, "no_lunch": [names], "no_dinner": [names], "no_break": [names]}
+        """
+        handlers = list(self.get_day_grids(day).values())
+        versions = tuple(handler.version for handler in handlers)
+        cached = self.break_cache.get(day)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+
+        # names of the grids being checked, in first seen order
+        name_index = {}
+        for handler in handlers:
+            for name in handler.grid.columns:
+                name_index.setdefault(name, len(name_index))
+        names = list(name_index)
+        # time blocks x names, True where the name is allocated at any location
+        allocated = np.zeros((len(tb.DAY_BLOCK_MAP[day]), len(names)), dtype=bool)
+        for handler in handlers:
+            columns = [name_index[name] for name in handler.grid.columns]
+            allocated[:, columns] |= handler.grid.view() != EMPTY_CODE
+
+        result = {"day": day}
+        no_break = set()
+        windows = tb.BREAK_ROW_WINDOWS[day]
+        for rule in tb.BREAK_WINDOWS:
+            missing = []
+            if rule in windows:
+                start, end = windows[rule]
+                missing_idx = np.flatnonzero(allocated[start : end + 1].all(axis=0))
+                missing = sorted(names[idx] for idx in missing_idx)
+            result[f"no_{rule}"] = missing
+            no_break.update(missing)
+        result["no_break"] = sorted(no_break)
+
+        self.break_cache[day] = (versions, result)
+        return result
+
+    def get_day_hours(self, day: int) -> dict:
+        """
+        Hours of every name allocated on a day and the day's total
+
+        Args:
+            day (int): which day
+        Returns:
+            dict: {"rowData": [{"Name": name, "Hours": hours}, ...], "total": total hours}
+        """
+        key = f"Day {day}"
+        names = self.existing_names[f"DAY{day}"]
+        row_data = [
+            {"Name": name, "Hours": data[key]}
+            for name, data in self.all_hours.items()
+            if name in names
+        ]
+        return {"rowData": row_data, "total": self.all_hours["TOTAL"][key]}
+
     def update_hours(self, name: str, target_grid: str):
         """
         Update hour data for a specified name and target_grid
@@ -142,14 +601,9 @@ class GridManager:
 
         handler = self.all_grids[target_grid]
         handler = cast(GridHandler, handler)
-        name_exists = False
-        # check if name exists
-        for names in self.existing_names.values():
-            if name in names:
-                name_exists = True
-                break
+        self.hours_version += 1
         # name no longer exists, remove all entry of this name
-        if not name_exists:
+        if not self.name_grids.get(name):
             __update_day_hours(handler.day, name, 0)
             self.all_hours.pop(name, None)
             return
@@ -166,8 +620,7 @@ class GridManager:
             }
             return
 
-        hour_data = handler.get_hours()
-        __update_day_hours(handler.day, name, hour_data[name])
+        __update_day_hours(handler.day, name, handler.hours[name])
 
     def serialise_to_zip(self):
         """
@@ -200,21 +653,115 @@ class GridManager:
         zip_buffer.seek(0)
         return zip_buffer.getvalue()
 
+    def serialise_to_snapshot(self) -> bytes:
+        """
+        Serialise GridManager and all GridHandler instances to the binary snapshot format
+        - Internal persistence format, the zip stays the /download/ and /upload/ format
+        - Layout: header (magic, format version, manifest length), JSON manifest with
+          all_hours and each handler's metadata, then each handler's location codes
+        - Bit masks and name tracking are derived from the grids on load
+
+        Returns:
+            bytes: snapshot of the manager
+        """
+        grids = []
+        payloads = []
+        for key in self.all_grids:
+            grid = self.all_grids.peek(key)
+            if isinstance(grid, PendingGrid) and grid.format == "snapshot":
+                # never accessed since a lazy restore, written back as stored
+                metadata, codes = grid.metadata, grid.payload
+            else:
+                handler = cast(GridHandler, self.all_grids[key])
+                metadata, codes = handler.serialise_to_snapshot()
+            grids.append([key, metadata])
+            payloads.append(codes)
+        manifest = encode_json({"all_hours": self.all_hours, "grids": grids})
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(manifest))
+        return b"".join((header, manifest, *payloads))
+
+    @classmethod
+    def deserialise_from_snapshot(
+        cls, snapshot: bytes, lazy: bool = False
+    ) -> "GridManager":
+        """
+        Reconstruct GridManager from serialise_to_snapshot bytes, without pandas or pyarrow
+
+        Args:
+            snapshot (bytes): serialised manager
+            lazy (bool): keep each handler's codes as stored until its grid is accessed
+        Raises:
+            ValueError: if the bytes are not a supported snapshot
+        """
+        magic, version, manifest_length = SNAPSHOT_HEADER.unpack_from(snapshot)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not a GridManager snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        offset = SNAPSHOT_HEADER.size
+        manifest = orjson.loads(snapshot[offset : offset + manifest_length])
+        offset += manifest_length
+
+        instance = cls.__new__(cls)
+        instance.requires_sync = True
+        instance.epoch = uuid.uuid4().hex[:12]
+        instance.hours_version = 0
+        instance.break_cache = {}
+        instance.all_hours = manifest["all_hours"]
+        instance.all_grids = LazyGrids()
+        template = get_grid_template()
+        view = memoryview(snapshot)
+        for key, metadata in manifest["grids"]:
+            size = len(template[metadata["day"]]) * len(metadata["names"])
+            pending = PendingGrid(
+                "snapshot", metadata, view[offset : offset + size], _load_snapshot_grid
+            )
+            if len(pending.payload) != size:
+                raise ValueError("Truncated GridManager snapshot")
+            offset += size
+            instance.all_grids[key] = pending if lazy else pending.load()
+        instance._rebuild_name_index()
+        instance.existing_names = {
+            day: set(counts) for day, counts in instance.name_counts.items()
+        }
+        instance._init_journal()
+        return instance
+
     @classmethod
-    def deserialise_from_zip(cls, zip_bytes: bytes) -> "GridManager":
+    def deserialise(cls, data: bytes, lazy: bool = False) -> "GridManager":
+        """
+        Reconstruct GridManager from a snapshot or a zip, detected from the leading bytes
+
+        Args:
+            data (bytes): serialised manager
+            lazy (bool): deserialise each handler on first access, see LazyGrids
+        """
+        if data[: len(SNAPSHOT_MAGIC)] == SNAPSHOT_MAGIC:
+            return cls.deserialise_from_snapshot(data, lazy)
+        return cls.deserialise_from_zip(data, lazy)
+
+    @classmethod
+    def deserialise_from_zip(cls, zip_bytes: bytes, lazy: bool = False) -> "GridManager":
         """
         Reconstruct GridManager from zip_bytes
+
+        Args:
+            zip_bytes (bytes): zip from serialise_to_zip
+            lazy (bool): keep each handler's parquet bytes until its grid is accessed
         """
         instance = cls.__new__(cls)
         with zipfile.ZipFile(io.BytesIO(zip_bytes), "r") as zip_file:
             # Read manifest
             manager_data = json.loads(zip_file.read("manager_info.json").decode())
             instance.requires_sync = True
+            instance.epoch = uuid.uuid4().hex[:12]
+            instance.hours_version = 0
+            instance.break_cache = {}
             instance.all_hours = manager_data["all_hours"]
             instance.existing_names = {
                 k: set(v) for k, v in manager_data["existing_names"].items()
             }
-            instance.all_grids = {}
+            instance.all_grids = LazyGrids()
 
             for key in manager_data["handler_keys"]:
                 folder = key.replace(":", "_")
@@ -222,9 +769,141 @@ class GridManager:
                 df_parquet_filename = f"handlers/{folder}/dataframe.parquet"
                 metadata_json = json.loads(zip_file.read(metadata_filename).decode())
                 df_bytes = zip_file.read(df_parquet_filename)
-                handler_instance = GridHandler.deserialise_from_storage(
-                    metadata_json, df_bytes
+                pending = PendingGrid(
+                    "zip", metadata_json, df_bytes, GridHandler.deserialise_from_storage
                 )
                 key.replace("_", ":")
-                instance.all_grids[key] = handler_instance
+                instance.all_grids[key] = pending if lazy else pending.load()
+        instance._rebuild_name_index()
+        instance._init_journal()
         return instance
+
+    def _init_journal(self):
+        """
+        Start an empty operation journal and share it with every handler
+        - journal: operations applied since the last persisted state, not yet stored
+        - journal_length: operations stored on top of the stored snapshot
+        - snapshot_stored: whether storage holds a snapshot the journal continues from
+        - persisted_digest / expiry_refreshed_at: set by CustomLRUCache.sync_to_firebase
+          to skip writes of unchanged sessions
+        """
+        self.journal: list[list] = []
+        self.journal_length = 0
+        self.snapshot_stored = False
+        self.persisted_digest: bytes | None = None
+        self.expiry_refreshed_at = None
+        self._attach_journal(self.journal)
+
+    def _attach_journal(self, journal: list | None):
+        self.all_grids.journal = journal  # for handlers deserialised later
+        for handler in self.all_grids.loaded():
+            handler.journal = journal
+
+    def needs_compaction(self) -> bool:
+        """
+        Whether the next sync must write a full snapshot instead of a journal segment
+        """
+        if not self.snapshot_stored:
+            return True
+        if self.journal_length + len(self.journal) > JOURNAL_COMPACTION_THRESHOLD:
+            return True
+        return any(op[1] not in REPLAYABLE_OPERATIONS for op in self.journal)
+
+    def journal_segment(self, count: int) -> bytes:
+        """
+        Encode the first count pending operations as a journal segment
+
+        Returns:
+            bytes: JSON {"start": index of the first operation, "ops": [...]}
+        """
+        return encode_json({"start": self.journal_length, "ops": self.journal[:count]})
+
+    def mark_stored(self, count: int, compacted: bool):
+        """
+        Drop the first count pending operations once storage holds them
+
+        Args:
+            count (int): number of operations written, operations added since are kept
+            compacted (bool): True if a full snapshot was written, False for a segment
+        """
+        del self.journal[:count]
+        if compacted:
+            self.journal_length = 0
+            self.snapshot_stored = True
+        else:
+            self.journal_length += count
+
+    def drop_journal(self, count: int):
+        """
+        Drop the first count pending operations without storing them
+        - Used when they left the grids in the state storage already holds
+        """
+        del self.journal[:count]
+
+    def replay_journal(self, segments: list[bytes]):
+        """
+        Apply stored journal segments on top of a restored snapshot
+        - Operations are applied the way the planner endpoints apply them, each followed
+          by update_hours for the names it touched
+        - Marks the snapshot as stored so following syncs only append segments
+
+        Args:
+            segments (list[bytes]): segments from journal_segment, in any order
+        Raises:
+            ValueError: on an operation that cannot be replayed
+        """
+        ops = []
+        for segment in sorted(map(orjson.loads, segments), key=lambda s: s["start"]):
+            ops.extend(segment["ops"])
+
+        pending = len(self.journal)
+        try:
+            for key, op, *args in ops:
+                self._apply_operation(key, op, args)
+        finally:
+            del self.journal[pending:]  # replayed operations are already stored
+        for key in {key for key, *_ in ops}:
+            self.all_grids[key].recompute_bit_mask()
+        self.journal_length = len(ops)
+        self.snapshot_stored = True
+
+    def _apply_operation(self, target_grid: str, op: str, args: list):
+        handler = cast(GridHandler, self.all_grids[target_grid])
+        if op == "add":
+            name, shifts = args
+            if not handler.name_exists(name):
+                handler.add_name(name, shifts)
+                self._track_added_name(name, target_grid, handler.day)
+            names = [name]
+        elif op == "remove":
+            self.remove_name(args[0], target_grid)
+            names = [args[0]]
+        elif op == "rename":
+            self.rename_name(args[0], args[1], target_grid)
+            names = [args[0], args[1]]
+        elif op == "swap":
+            handler.swap_names(args[0], args[1])
+            names = [args[0], args[1]]
+        elif op == "allocate":
+            handler.allocate_shift(*args)
+            names = [args[2]]
+        elif op == "range":
+            handler.allocate_range(*args)
+            names = [args[3]]
+        else:
+            raise ValueError(f"Journal operation {op} cannot be replayed")
+        for name in names:
+            self.update_hours(name, target_grid)
+
+    def _rebuild_name_index(self):
+        """
+        Rebuild name_counts and name_grids from the names in every handler
+        """
+        self.name_counts = {"DAY1": Counter(), "DAY2": Counter(), "DAY3": Counter()}
+        self.name_grids = {}
+        for key in self.all_grids:
+            # names are read from the metadata of grids that are not deserialised yet
+            names = self.all_grids.peek(key).names
+            self.name_counts[key.partition(":")[0]].update(names)
+            for name in names:
+                self.name_grids.setdefault(name, set()).add(key)
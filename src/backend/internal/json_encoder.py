@@ -0,0 +1,30 @@
+"""
+JSON encoding for planner responses
+
+Payloads are encoded with orjson, which produces the same compact utf-8 output as fastapi's
+JSONResponse at a fraction of the cost. Cached payloads can be served as is.
+"""
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def encode_json(content) -> bytes:
+    """
+    Encode content to compact JSON bytes, same output as JSONResponse.render
+
+    Args:
+        content: JSON serialisable python object, numpy scalars and arrays included
+    Returns:
+        bytes: utf-8 encoded JSON
+    """
+    return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with encode_json
+    """
+
+    def render(self, content) -> bytes:
+        return encode_json(content)
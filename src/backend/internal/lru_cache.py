@@ -6,6 +6,7 @@ On evict, the GridManager class is intercepted and the data is saved to firebase
 
 import logging
 import base64
+import hashlib
 import threading
 from cachetools import LRUCache
 from datetime import datetime, timedelta, timezone
@@ -15,6 +16,35 @@ from src.backend.internal.grid_manager import GridManager
 from src.backend.config import config
 
 
+# marks documents whose "data" field holds the raw snapshot bytes
+# documents without it hold base64 text of a snapshot or zip
+STORAGE_FORMAT = "snapshot-bytes"
+
+
+# unchanged sessions only refresh their document expiry this often
+EXPIRY_REFRESH_INTERVAL = timedelta(days=config.DATA_EXPIRY_LENGTH) / 4
+
+
+def snapshot_digest(snapshot: bytes) -> bytes:
+    """
+    Digest of a serialised snapshot, compared to skip writing unchanged sessions
+    """
+    return hashlib.blake2b(snapshot, digest_size=16).digest()
+
+
+def decode_stored_data(document: dict) -> bytes:
+    """
+    Returns the serialised GridManager held by a session document
+
+    Args:
+        document (dict): Firestore session document as a dict
+    """
+    data = document.get("data")
+    if document.get("format") == STORAGE_FORMAT:
+        return bytes(data)
+    return base64.b64decode(data)  # legacy document
+
+
 class CustomLRUCache(LRUCache):
     def __init__(self, maxsize, firebase_client=None, **kwargs):
         super().__init__(maxsize, **kwargs)
@@ -53,29 +83,58 @@ class CustomLRUCache(LRUCache):
     def sync_to_firebase(self, session_id: str, manager: GridManager) -> bool:
         """
         Sync GridManager data to firebase
+        - Appends the operations journaled since the last sync to the stored document
+        - Writes a full snapshot (compaction) instead when GridManager.needs_compaction
+        - Skips the write if the snapshot digest matches the last persisted state, only
+          refreshing the expiry every EXPIRY_REFRESH_INTERVAL
 
         Args:
             session_id(str): session id to sync data under
             manager(str): GridManager instance for this session id
         """
         try:
-            zip_bytes = manager.serialise_to_zip()
-            encoded_zip = base64.b64encode(zip_bytes).decode("utf-8")
-
             doc_id = f"session_id:{session_id}"
             doc_ref = self.firebase.collection(self.__DB_COLLECTION_NAME).document(doc_id)
             updated = datetime.now(timezone.utc)
             expire_at = updated + timedelta(days=config.DATA_EXPIRY_LENGTH)
-
-            doc_ref.set(
-                {
-                    "updated": updated,
-                    "expireAt": expire_at,
-                    "data": encoded_zip,
-                    "size": len(zip_bytes),
-                    "session_id":session_id
-                }
-            )
+            count = len(manager.journal)  # operations journaled after this are kept
+            snapshot = manager.serialise_to_snapshot()
+            digest = snapshot_digest(snapshot)
+
+            if digest == manager.persisted_digest:
+                # storage already holds this state
+                manager.drop_journal(count)
+                last_refresh = manager.expiry_refreshed_at
+                if last_refresh is None or updated - last_refresh >= EXPIRY_REFRESH_INTERVAL:
+                    doc_ref.update({"updated": updated, "expireAt": expire_at})
+                    manager.expiry_refreshed_at = updated
+                manager.requires_sync = False
+                logging.debug("Session %s unchanged, skipped sync", session_id)
+                return
+
+            if manager.needs_compaction():
+                doc_ref.set(
+                    {
+                        "updated": updated,
+                        "expireAt": expire_at,
+                        "data": snapshot,  # stored as a Firestore bytes (Blob) field
+                        "format": STORAGE_FORMAT,
+                        "journal": [],
+                        "digest": digest,  # read back by restore_from_database
+                        "size": len(snapshot),
+                        "session_id":session_id
+                    }
+                )
+                manager.mark_stored(count, compacted=True)
+            else:
+                fields = {"updated": updated, "expireAt": expire_at, "digest": digest}
+                if count:
+                    segment = manager.journal_segment(count)
+                    fields["journal"] = firestore.ArrayUnion([segment])
+                doc_ref.update(fields)
+                manager.mark_stored(count, compacted=False)
+            manager.persisted_digest = digest
+            manager.expiry_refreshed_at = updated
             manager.requires_sync = False
             logging.debug("Synced session %s to Firestore", session_id)
 
@@ -84,7 +143,6 @@ class CustomLRUCache(LRUCache):
                 "Failed to sync session %s to Firestore: %s", session_id, e
             )
 
-
 if __name__ == "__main__":
     cred_path = config.GOOGLE_APPLICATION_CREDENTIALS
     cred = credentials.Certificate(cred_path)
@@ -0,0 +1,178 @@
+"""
+Integer coded storage for shift data used by GridHandler
+
+Each cell of a grid only ever holds one of a handful of location strings, so the grid is
+stored as a uint8 matrix (time slots x names) of location codes instead of a DataFrame of
+python strings. Names map to their column through a dictionary, making single cell reads
+and writes O(1) array accesses.
+"""
+
+import numpy as np
+
+LOCATION_CODES = ("0", "MCC", "HCC1", "HCC2")  # code -> location, "0" is unallocated
+LOCATION_TO_CODE = {location: code for code, location in enumerate(LOCATION_CODES)}
+EMPTY_CODE = LOCATION_TO_CODE["0"]
+_LOCATION_ARRAY = np.array(LOCATION_CODES, dtype=object)
+
+
+def encode(locations: list[str]) -> np.ndarray:
+    """
+    Encode a list of location strings to location codes
+
+    Args:
+        locations (list[str]): e.g. ["0", "MCC", "MCC", "HCC1"]
+    Returns:
+        np.ndarray: uint8 array of location codes
+    """
+    return np.fromiter(
+        (LOCATION_TO_CODE[location] for location in locations),
+        dtype=np.uint8,
+        count=len(locations),
+    )
+
+
+def decode(codes: np.ndarray) -> np.ndarray:
+    """
+    Decode location codes back to location strings
+
+    Args:
+        codes (np.ndarray): array of location codes
+    Returns:
+        np.ndarray: object array of location strings with the same shape as codes
+    """
+    return _LOCATION_ARRAY[codes]
+
+
+class ShiftMatrix:
+    """
+    uint8 matrix of location codes with one row per time slot and one column per name
+
+    - Columns keep their insertion order, matching the column order of the old DataFrame
+    - Storage grows by doubling so adding a name does not reallocate every time
+    """
+
+    def __init__(self, num_rows: int, capacity: int = 8):
+        self.codes = np.zeros((num_rows, capacity), dtype=np.uint8)
+        self.columns: list[str] = []
+        self.column_index: dict[str, int] = {}
+
+    @classmethod
+    def from_codes(
+        cls, codes: np.ndarray, columns: list[str], capacity: int = 8
+    ) -> "ShiftMatrix":
+        """
+        Build a matrix from a (num_rows x num_columns) array of location codes in one copy
+
+        Args:
+            codes (np.ndarray): location codes, one column per name
+            columns (list[str]): names in column order
+            capacity (int): minimum number of columns to allocate
+        """
+        num_rows, num_columns = codes.shape
+        instance = cls(num_rows, capacity=max(capacity, num_columns))
+        instance.codes[:, :num_columns] = codes
+        instance.columns = list(columns)
+        instance.column_index = {name: idx for idx, name in enumerate(columns)}
+        return instance
+
+    @property
+    def num_rows(self) -> int:
+        return self.codes.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes
+
+    def view(self) -> np.ndarray:
+        """
+        Returns the used portion of the matrix (num_rows x num_columns) without copying
+        """
+        return self.codes[:, : len(self.columns)]
+
+    def has_column(self, name: str) -> bool:
+        return name in self.column_index
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns the location codes of a name as a view into the matrix
+        """
+        return self.codes[:, self.column_index[name]]
+
+    def get(self, row: int, name: str) -> int:
+        return int(self.codes[row, self.column_index[name]])
+
+    def set(self, row: int, name: str, code: int):
+        self.codes[row, self.column_index[name]] = code
+
+    def set_span(self, start_row: int, end_row: int, name: str, code: int):
+        """
+        Write one code to an inclusive span of rows of a column
+        """
+        self.codes[start_row : end_row + 1, self.column_index[name]] = code
+
+    def add_column(self, name: str, codes: np.ndarray | None = None):
+        """
+        Append a column for a name
+
+        Args:
+            name (str): column name, must not already exist
+            codes (np.ndarray): optional location codes for the column, defaults to all empty
+        """
+        idx = len(self.columns)
+        if idx == self.codes.shape[1]:
+            self._grow()
+        if codes is None:
+            self.codes[:, idx] = EMPTY_CODE
+        else:
+            self.codes[:, idx] = codes
+        self.columns.append(name)
+        self.column_index[name] = idx
+
+    def remove_column(self, name: str) -> np.ndarray:
+        """
+        Remove the column of a name, columns to its right shift left by one
+
+        Returns:
+            np.ndarray: copy of the removed column codes
+        """
+        idx = self.column_index.pop(name)
+        removed = self.codes[:, idx].copy()
+        end = len(self.columns)
+        self.codes[:, idx : end - 1] = self.codes[:, idx + 1 : end]
+        self.codes[:, end - 1] = EMPTY_CODE
+        del self.columns[idx]
+        for i in range(idx, len(self.columns)):
+            self.column_index[self.columns[i]] = i
+        return removed
+
+    def rename_column(self, old_name: str, new_name: str):
+        idx = self.column_index.pop(old_name)
+        self.columns[idx] = new_name
+        self.column_index[new_name] = idx
+
+    def swap_columns(self, name1: str, name2: str):
+        """
+        Swap the labels of two columns, each name takes over the other's data
+        """
+        idx1 = self.column_index[name1]
+        idx2 = self.column_index[name2]
+        self.columns[idx1], self.columns[idx2] = name2, name1
+        self.column_index[name1], self.column_index[name2] = idx2, idx1
+
+    def copy(self) -> "ShiftMatrix":
+        instance = ShiftMatrix.__new__(ShiftMatrix)
+        instance.codes = self.codes.copy()
+        instance.columns = self.columns.copy()
+        instance.column_index = self.column_index.copy()
+        return instance
+
+    def equals(self, other: "ShiftMatrix") -> bool:
+        return self.columns == other.columns and np.array_equal(
+            self.view(), other.view()
+        )
+
+    def _grow(self):
+        capacity = max(1, self.codes.shape[1] * 2)
+        codes = np.zeros((self.num_rows, capacity), dtype=np.uint8)
+        codes[:, : self.codes.shape[1]] = self.codes
+        self.codes = codes
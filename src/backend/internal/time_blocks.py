@@ -139,3 +139,32 @@ DAY_3_BLOCKS = [
 DAY_BLOCK_MAP = {1: DAY_1_BLOCKS, 2: DAY_2_BLOCKS, 3: DAY_3_BLOCKS}
 
 HALF_DAY_BLOCK_MAP = {1: DAY_1_HALF_BLOCKS, 2: DAY_2_HALF_BLOCKS, 3: DAY_3_HALF_BLOCKS}
+
+# Lookup tables generated at import time so slot lookups are O(1) dictionary reads
+# time block -> row index in the day's grid e.g. DAY 1: "07:00" -> 0, "07:30" -> 1
+BLOCK_INDEX_MAP = {
+    day: {block: idx for idx, block in enumerate(blocks)}
+    for day, blocks in DAY_BLOCK_MAP.items()
+}
+
+# time block -> index of the 1h pair it belongs to e.g. DAY 1: "07:00" -> 0, "07:30" -> 0
+PAIR_INDEX_MAP = {
+    day: {block: idx // 2 for idx, block in enumerate(blocks)}
+    for day, blocks in DAY_BLOCK_MAP.items()
+}
+
+# meal break windows, a name allocated in every time block of a window gets no break
+# lunch  = 1130-1330 >> I.e. cannot start from 1100 and end at 1330 without break
+# dinner = 1700-1830 >> cannot start at 1700 and end at 1830 without break
+BREAK_WINDOWS = {"lunch": ("11:00", "13:00"), "dinner": ("17:00", "18:00")}
+
+# day -> rule -> inclusive (first row, last row) of the window in the day's grid
+# days that do not cover a window (e.g. DAY 3 night duty) leave that rule out
+BREAK_ROW_WINDOWS = {
+    day: {
+        rule: (BLOCK_INDEX_MAP[day][start], BLOCK_INDEX_MAP[day][end])
+        for rule, (start, end) in BREAK_WINDOWS.items()
+        if start in BLOCK_INDEX_MAP[day] and end in BLOCK_INDEX_MAP[day]
+    }
+    for day in DAY_BLOCK_MAP
+}
@@ -1,9 +1,9 @@
 import io
 import uuid
-import base64
+import asyncio
 import logging
 from typing import cast
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import StreamingResponse, Response
 from fastapi import (
     APIRouter,
     Depends,
@@ -13,18 +13,29 @@ from fastapi import (
     UploadFile,
     File,
     Cookie,
+    Query,
 )
 from pydantic import BaseModel, Field
 from typing import Annotated, Literal
 from google.cloud.firestore import Client
 from src.backend.internal.grid_manager import GridManager, GridHandler
 import src.backend.internal.time_blocks as tb
-from src.backend.internal.lru_cache import CustomLRUCache
+from src.backend.internal.lru_cache import CustomLRUCache, decode_stored_data
+from src.backend.internal.json_encoder import FastJSONResponse, encode_json
+from src.backend.internal.event_bus import SessionEventBus
 from src.backend.config import config
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 
 DB_COLLECTION_NAME = config.DB_COLLECTION_NAME
+SSE_KEEPALIVE_INTERVAL = 15  # seconds between keep-alive comments on idle streams
+
+HOURS_COLUMN_DEFS = encode_json(
+    [
+        {"headerName": field, "field": field}
+        for field in ("Name", "Day 1", "Day 2", "Day 3", "Total")
+    ]
+)
 
 
 def restore_from_database(db: Client, session_id: str) -> GridManager | None:
@@ -41,9 +52,16 @@ def restore_from_database(db: Client, session_id: str) -> GridManager | None:
     try:
         doc_ref = db.collection(DB_COLLECTION_NAME).document(f"session_id:{session_id}")
         doc = doc_ref.get()
-        data = doc.to_dict()
-        decoded_bytes = base64.b64decode(data.get("data"))
-        manager = GridManager.deserialise_from_zip(decoded_bytes)
+        document = doc.to_dict()
+        stored_bytes = decode_stored_data(document)
+        # snapshot, or zip for documents written before the snapshot format
+        manager = GridManager.deserialise(stored_bytes, lazy=True)
+        # operations synced since the snapshot was written
+        manager.replay_journal(document.get("journal", []))
+        # digest of the stored state written by the last sync, evicting the session
+        # unchanged writes nothing. Documents from before digests were stored have none
+        manager.persisted_digest = document.get("digest")
+        manager.expiry_refreshed_at = document.get("updated")
         return manager
     except Exception as e:
         logging.info(
@@ -107,6 +125,65 @@ def get_manager(
     return manager
 
 
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Checks if the If-None-Match request header matches an ETag
+
+    Args:
+        request (Request): incoming request
+        etag (str): current ETag of the resource
+    Returns:
+        True if the client's cached copy is still valid
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def publish_event(request: Request, session_id: str | None, event: dict):
+    """
+    Publish a mutation event to the /events/ streams of a session
+
+    Args:
+        request (Request): incoming request, the event bus lives in app state
+        session_id (str): session that was mutated, nothing is published if None
+        event (dict): {"type": "delta", "delta": ...} or {"type": "refresh", ...}
+    """
+    event_bus = getattr(request.app.state, "event_bus", None)
+    if session_id is None or event_bus is None:
+        return
+    event_bus.publish(session_id, event)
+
+
+async def stream_events(request: Request, event_bus: SessionEventBus, session_id: str):
+    """
+    Server-Sent Events stream of a session's events
+    - Subscribes once the stream is iterated, a client gone before then never subscribes
+    - A comment is sent when idle so proxies keep the connection open
+    - The queue is unsubscribed once the client disconnects
+    """
+    queue = None
+    try:
+        queue = event_bus.subscribe(session_id)
+        yield b": connected\n\n"
+        while not await request.is_disconnected():
+            try:
+                yield await asyncio.wait_for(queue.get(), SSE_KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+    finally:
+        if queue is not None:
+            event_bus.unsubscribe(session_id, queue)
+
+
 # Request body schema
 class UploadRequest(BaseModel):
     session_id: str
@@ -119,6 +196,11 @@ class FetchGridRequest(BaseModel):
     location: Literal["MCC", "HCC1", "HCC2"]
 
 
+class FetchDayRequest(BaseModel):
+    day: Literal[1, 2, 3]
+    compressed: bool = False  # day 3 only, night duty compressed format
+
+
 class AddOrRemoveRequest(BaseModel):
     grid_name: Literal[
         "DAY1:MCC",
@@ -138,6 +220,19 @@ class AllocateShiftRequest(AddOrRemoveRequest):
     time_block: str
 
 
+class AllocateRangeRequest(AddOrRemoveRequest):
+    location: Literal["MCC", "HCC1", "HCC2"]
+    start_block: str
+    end_block: str
+    mode: Literal["set", "clear"] = "set"
+
+
+class BatchAllocateRequest(BaseModel):
+    operations: Annotated[
+        list[AllocateShiftRequest], Field(min_length=1, max_length=1000)
+    ]
+
+
 class SwapNameRequest(BaseModel):
     grid_name: Literal[
         "DAY1:MCC",
@@ -188,7 +283,7 @@ async def login(
         # request.app.state.all_ids.add(session_id)  # add to existing ids
         request.app.state.manager_cache[session_id] = manager  # add to lru cache
 
-    response = JSONResponse(
+    response = FastJSONResponse(
         status_code=status.HTTP_200_OK, content={"detail": "login successful"}
     )
 
@@ -224,7 +319,7 @@ async def login(
 async def get_num_cached_items(request: Request):
     cache: CustomLRUCache = request.app.state.manager_cache
     response = {"current_size": cache.currsize, "num_items": len(cache.items())}
-    return JSONResponse(status_code=status.HTTP_200_OK, content=response)
+    return FastJSONResponse(status_code=status.HTTP_200_OK, content=response)
 
 
 @router.get("/session_exists/")  # protected
@@ -234,36 +329,34 @@ async def session_exists(request: Request, session_id: str):
         session_id, request.app.state.manager_cache, request.app.state.db
     )
     response = {"exists": exists, "location": location}
-    return JSONResponse(status_code=status.HTTP_200_OK, content=response)
+    return FastJSONResponse(status_code=status.HTTP_200_OK, content=response)
 
 
 @router.post("/grid/")  # get all grid data for a specified day
 async def get_grid(
+    request: Request,
     fetch_grid_req: FetchGridRequest,
     manager: GridManager = Depends(get_manager),
 ):
-    result = {}
-    bit_masks = {}
     day = fetch_grid_req.day
     location = fetch_grid_req.location
-    # find the required handlers
-    for key, handler in manager.all_grids.items():
-        if f"DAY{day}" not in key:
-            continue
-        num = len(bit_masks) + 1
-        bit_masks[f"bit_mask_{num}"] = handler.bit_mask
-
+    handler = manager.all_grids.get(f"DAY{day}:{location}")
+    if handler is None:
+        return FastJSONResponse(status_code=status.HTTP_200_OK, content={})
+    handler = cast(GridHandler, handler)
+    etag = manager.grid_etag(day, location)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     # format the keys
-    blocks_to_remove = manager.format_keys(tb.HALF_DAY_BLOCK_MAP[day], **bit_masks)
-    # get the formatted dataframe in aggrid format
-    for key, handler in manager.all_grids.items():
-        if f"DAY{day}" not in key or location not in key:
-            continue
-        handler = cast(GridHandler, handler)
-        formatted_df = handler.generate_formatted_dataframe(blocks_to_remove)
-        aggrid_format = handler.df_to_aggrid_format(formatted_df)
-        result["data"] = aggrid_format
-    return JSONResponse(status_code=status.HTTP_200_OK, content=result)
+    blocks_to_remove = manager.get_blocks_to_remove(day)
+    # rendered aggrid payload, served from the handler's cache when unchanged
+    body = handler.render_aggrid(blocks_to_remove)
+    return Response(
+        status_code=status.HTTP_200_OK,
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
 
 
 @router.post("/grid/compressed")
@@ -274,18 +367,66 @@ async def get_grid_compressed(
 ):
     day = fetch_grid_req.day
     if day != 3:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"detail": "Call for day 3 grid only"},
         )
     handler = manager.all_grids["DAY3:MCC"]
     handler = cast(GridHandler, handler)
+    etag = manager.grid_etag(day, handler.location, compressed=True)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     blocks_to_remove = manager.format_keys(tb.HALF_DAY_BLOCK_MAP[day], handler.bit_mask)
-    formatted_df = handler.generate_formatted_dataframe(blocks_to_remove)
-    aggrid_format_compressed = handler.df_to_aggrid_compressed(formatted_df)
+    body = handler.render_aggrid(blocks_to_remove, compressed=True)
+
+    return Response(
+        status_code=status.HTTP_200_OK,
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
+
 
-    return JSONResponse(
-        status_code=status.HTTP_200_OK, content={"data": aggrid_format_compressed}
+@router.post("/grid/day/")  # every location grid of a day and the day's hours
+async def get_day(
+    request: Request,
+    fetch_day_req: FetchDayRequest,
+    manager: GridManager = Depends(get_manager),
+):
+    day = fetch_day_req.day
+    compressed = fetch_day_req.compressed
+    if compressed and day != 3:
+        return FastJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": "Compressed format is for day 3 grid only"},
+        )
+    etag = manager.day_etag(day, compressed)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    # shared by every grid of the day, computed once
+    blocks_to_remove = manager.get_blocks_to_remove(day)
+    grids = [
+        b'"%s":%s'
+        % (
+            handler.location.encode(),
+            handler.render_aggrid_data(blocks_to_remove, compressed),
+        )
+        for handler in manager.get_day_grids(day).values()
+    ]
+    body = b"".join(
+        (
+            b'{"data":{',
+            b",".join(grids),
+            b'},"hours":',
+            encode_json(manager.get_day_hours(day)),
+            b"}",
+        )
+    )
+    return Response(
+        status_code=status.HTTP_200_OK,
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag},
     )
 
 
@@ -300,11 +441,11 @@ async def get_names(
     grid_handler: GridHandler = manager.all_grids.get(target_grid, None)
     if grid_handler is None:
         logging.error("Target Grid is None, may not be initialised in manager")
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={}
         )
     existing_names = grid_handler.get_names()
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_200_OK, content={"names": list(existing_names)}
     )
 
@@ -314,29 +455,29 @@ async def add_name(
     request: Request,
     add_req: AddOrRemoveRequest,
     manager: GridManager = Depends(get_manager),
+    session_id: str | None = Cookie(None, alias="session_id"),
 ):
     target_grid = add_req.grid_name
     day = target_grid[3]
     name = add_req.name.upper()
     if manager.name_exists(name, day):
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_200_OK,
             content={"detail": f"{name} already exists in DAY:{day}"},
         )
 
-    grid_handler = manager.all_grids[target_grid]
-    grid_handler = cast(GridHandler, grid_handler)
-    if name.upper() in grid_handler.get_names():
-        return JSONResponse(
+    snapshot = manager.snapshot(target_grid, [name])
+    if not manager.add_name(name, target_grid):
+        return FastJSONResponse(
             status_code=status.HTTP_200_OK,
             content={"detail": f"{name} already exists in {target_grid}"},
         )
-    grid_handler.add_name(name)
-    manager.update_existing_names(day)
     manager.update_hours(name, target_grid)
-    return JSONResponse(
+    delta = manager.delta(snapshot)
+    publish_event(request, session_id, {"type": "delta", "delta": delta})
+    return FastJSONResponse(
         status_code=status.HTTP_201_CREATED,
-        content={"detail": f"{name} added to {target_grid}"},
+        content={"detail": f"{name} added to {target_grid}", "delta": delta},
     )
 
 
@@ -345,29 +486,32 @@ async def remove_name(
     request: Request,
     remove_req: AddOrRemoveRequest,
     manager: GridManager = Depends(get_manager),
+    session_id: str | None = Cookie(None, alias="session_id"),
 ):
     target_grid = remove_req.grid_name
-    day = target_grid[3]
     name = remove_req.name.upper()
-    grid_handler = manager.all_grids[target_grid]
-    grid_handler = cast(GridHandler, grid_handler)
-    if name.upper() not in grid_handler.get_names():
-        return JSONResponse(
+    snapshot = manager.snapshot(target_grid, [name])
+    if manager.remove_name(name, target_grid) is None:
+        return FastJSONResponse(
             status_code=status.HTTP_404_NOT_FOUND,
             content={"detail": f"{name} does not exist in {target_grid}"},
         )
-    grid_handler.remove_name(name)
-    manager.update_existing_names(day)
     manager.update_hours(name, target_grid)
+    delta = manager.delta(snapshot)
+    publish_event(request, session_id, {"type": "delta", "delta": delta})
 
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_200_OK,
-        content={"detail": f"Removed {name} from {target_grid}"},
+        content={"detail": f"Removed {name} from {target_grid}", "delta": delta},
     )
 
 
 def __resolve_allocation_size(
-    day: int, time_block: str, allocation_size: str, manager: GridManager
+    day: int,
+    time_block: str,
+    allocation_size: str,
+    manager: GridManager,
+    blocks_to_remove: list[str] | None = None,
 ) -> str:
     """
     Helper function for allocate shift to resolve allocation size
@@ -377,6 +521,7 @@ def __resolve_allocation_size(
         time_block(str): Time block for allocation
         allocation_size(str): The current allocation size
         manager: GridManager instance
+        blocks_to_remove(list[str]): Precomputed blocks_to_remove for the day, computed if None
 
     Returns:
         str: The resolved allocation size
@@ -388,16 +533,9 @@ def __resolve_allocation_size(
     # check if other half time block is displayed
     # if displayed we control allocation to first half only
     if ":00" in time_block:
-        bit_masks = {}
-        # extract bitmasks
-        for key, handler in manager.all_grids.items():
-            if f"DAY{day}" not in key:
-                continue
-            num = len(bit_masks) + 1
-            bit_masks[f"bit_mask_{num}"] = handler.bit_mask
-
         # format the keys
-        blocks_to_remove = manager.format_keys(tb.HALF_DAY_BLOCK_MAP[day], **bit_masks)
+        if blocks_to_remove is None:
+            blocks_to_remove = manager.get_blocks_to_remove(day)
 
         other_half = time_block[:-2] + "30"
         if other_half not in blocks_to_remove:
@@ -405,18 +543,48 @@ def __resolve_allocation_size(
     return allocation_size
 
 
+def __apply_allocation(
+    grid_handler: GridHandler,
+    location: str,
+    time_block: str,
+    name: str,
+    allocation_size: str,
+    update_mask: bool = True,
+):
+    """
+    Helper function to allocate a resolved allocation size on a grid handler
+
+    Args:
+        grid_handler: target GridHandler instance
+        location(str): location to allocate
+        time_block(str): Time block for allocation
+        name(str): name to allocate to
+        allocation_size(str): resolved allocation size "0.25", "0.75" or "1"
+        update_mask(bool): passed on to GridHandler.allocate_shift
+    """
+    second_half = time_block[:-2] + "30"
+    if allocation_size == "1":
+        grid_handler.allocate_shift(location, time_block, name, update_mask)
+        grid_handler.allocate_shift(location, second_half, name, update_mask)
+    elif allocation_size == "0.25":
+        grid_handler.allocate_shift(location, time_block, name, update_mask)
+    elif allocation_size == "0.75":
+        grid_handler.allocate_shift(location, second_half, name, update_mask)
+
+
 @router.post("/grid/allocate/")
 async def allocate_shift(
     request: Request,
     allocate_shift_req: AllocateShiftRequest,
     manager: GridManager = Depends(get_manager),
+    session_id: str | None = Cookie(None, alias="session_id"),
 ):
     target_grid = allocate_shift_req.grid_name
     name = allocate_shift_req.name.upper()
     grid_handler = manager.all_grids[target_grid]
     grid_handler = cast(GridHandler, grid_handler)
     if name not in grid_handler.get_names():
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_404_NOT_FOUND,
             content={"detail": f"{name} does not exist in {target_grid}"},
         )
@@ -431,19 +599,13 @@ async def allocate_shift(
         grid_handler.day, time_block, allocation_size, manager
     )
 
-    if allocation_size == "1":
-        grid_handler.allocate_shift(location, time_block, name)
-        second_half = time_block[:-2] + "30"
-        grid_handler.allocate_shift(location, second_half, name)
-
-    elif allocation_size == "0.25":
-        grid_handler.allocate_shift(location, time_block, name)
-    elif allocation_size == "0.75":
-        second_half = time_block[:-2] + "30"
-        grid_handler.allocate_shift(location, second_half, name)
+    snapshot = manager.snapshot(target_grid, [name])
+    __apply_allocation(grid_handler, location, time_block, name, allocation_size)
     manager.update_hours(name, target_grid)
+    delta = manager.delta(snapshot)
+    publish_event(request, session_id, {"type": "delta", "delta": delta})
 
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "detail": "Allocated",
@@ -452,40 +614,185 @@ async def allocate_shift(
             "time_block": time_block,
             "allocation_size": allocation_size,
             "location": location,
+            "delta": delta,
+        },
+    )
+
+
+@router.post("/grid/allocate/batch")
+async def allocate_shift_batch(
+    request: Request,
+    batch_req: BatchAllocateRequest,
+    manager: GridManager = Depends(get_manager),
+    session_id: str | None = Cookie(None, alias="session_id"),
+):
+    # all names are checked before anything is applied
+    for operation in batch_req.operations:
+        name = operation.name.upper()
+        if not manager.all_grids[operation.grid_name].name_exists(name):
+            return FastJSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={
+                    "detail": f"{name} does not exist in {operation.grid_name}"
+                },
+            )
+
+    # allocation sizes are resolved against the layout the client had when sending
+    # the batch, so blocks_to_remove is computed once per day before applying
+    day_blocks_to_remove = {}
+    touched = {}  # target_grid -> names allocated in that grid
+    applied = []
+    for operation in batch_req.operations:
+        target_grid = operation.grid_name
+        name = operation.name.upper()
+        grid_handler = manager.all_grids[target_grid]
+        grid_handler = cast(GridHandler, grid_handler)
+        day = grid_handler.day
+        if day not in day_blocks_to_remove:
+            day_blocks_to_remove[day] = manager.get_blocks_to_remove(day)
+
+        allocation_size = __resolve_allocation_size(
+            day,
+            operation.time_block,
+            operation.allocation_size,
+            manager,
+            day_blocks_to_remove[day],
+        )
+        __apply_allocation(
+            grid_handler,
+            operation.location,
+            operation.time_block,
+            name,
+            allocation_size,
+            update_mask=False,
+        )
+        touched.setdefault(target_grid, set()).add(name)
+        applied.append(
+            {
+                "target_grid": target_grid,
+                "name": name,
+                "time_block": operation.time_block,
+                "allocation_size": allocation_size,
+                "location": operation.location,
+            }
+        )
+
+    # masks and hours are updated once per touched grid
+    for target_grid, names in touched.items():
+        manager.all_grids[target_grid].recompute_bit_mask()
+        for name in names:
+            manager.update_hours(name, target_grid)
+    # the client refetches the touched grids instead of patching many cells
+    publish_event(request, session_id, {"type": "refresh", "grids": list(touched)})
+
+    return FastJSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={"detail": "Allocated", "operations": applied},
+    )
+
+
+@router.post("/grid/allocate/range")
+async def allocate_range(
+    request: Request,
+    allocate_range_req: AllocateRangeRequest,
+    manager: GridManager = Depends(get_manager),
+    session_id: str | None = Cookie(None, alias="session_id"),
+):
+    target_grid = allocate_range_req.grid_name
+    name = allocate_range_req.name.upper()
+    grid_handler = manager.all_grids[target_grid]
+    grid_handler = cast(GridHandler, grid_handler)
+    if name not in grid_handler.get_names():
+        return FastJSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"detail": f"{name} does not exist in {target_grid}"},
+        )
+
+    start_block = allocate_range_req.start_block
+    end_block = allocate_range_req.end_block
+    snapshot = manager.snapshot(target_grid, [name])
+    allocated = grid_handler.allocate_range(
+        allocate_range_req.location,
+        start_block,
+        end_block,
+        name,
+        allocate_range_req.mode,
+    )
+    if not allocated:
+        return FastJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "detail": f"{start_block} to {end_block} is not a valid time range"
+            },
+        )
+    manager.update_hours(name, target_grid)
+    delta = manager.delta(snapshot)
+    publish_event(request, session_id, {"type": "delta", "delta": delta})
+
+    return FastJSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "detail": "Allocated",
+            "target_grid": target_grid,
+            "name": name,
+            "start_block": start_block,
+            "end_block": end_block,
+            "location": allocate_range_req.location,
+            "mode": allocate_range_req.mode,
+            "delta": delta,
         },
     )
 
 
+@router.get("/breaks/")  # names without a lunch or dinner break on a day
+async def get_breaks(
+    request: Request,
+    day: Annotated[int, Query(ge=1, le=3)],
+    manager: GridManager = Depends(get_manager),
+):
+    return FastJSONResponse(
+        status_code=status.HTTP_200_OK, content=manager.check_breaks(day)
+    )
+
+
 @router.get("/hours/")
 async def get_all_hours(request: Request, manager: GridManager = Depends(get_manager)):
+    etag = manager.hours_etag()
+    if etag_matches(request, etag):
+        return not_modified(etag)
     row_data, pinned_row_data = manager.get_all_hours()
-    response = {
-        "columnDefs": [
-            {
-                "headerName": "Name",
-                "field": "Name",
-            },
-            {
-                "headerName": "Day 1",
-                "field": "Day 1",
-            },
-            {
-                "headerName": "Day 2",
-                "field": "Day 2",
-            },
-            {
-                "headerName": "Day 3",
-                "field": "Day 3",
-            },
-            {
-                "headerName": "Total",
-                "field": "Total",
-            },
-        ],
-        "rowData": row_data,
-        "pinnedBottomRowData": pinned_row_data,
-    }
-    return response
+    # columnDefs never change, splice in the pre-encoded fragment
+    body = b"".join(
+        (
+            b'{"columnDefs":',
+            HOURS_COLUMN_DEFS,
+            b',"rowData":',
+            encode_json(row_data),
+            b',"pinnedBottomRowData":',
+            encode_json(pinned_row_data),
+            b"}",
+        )
+    )
+    return Response(
+        status_code=status.HTTP_200_OK,
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
+
+
+@router.get("/events/")  # server push of mutations made by other tabs/devices
+async def get_events(
+    request: Request,
+    session_id: str = Cookie(..., alias="session_id"),
+    manager: GridManager = Depends(get_manager),
+):
+    event_bus: SessionEventBus = request.app.state.event_bus
+    return StreamingResponse(
+        stream_events(request, event_bus, session_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/download/")
@@ -513,10 +820,11 @@ async def upload_file(
         zip_bytes = await file.read()
         manager_instance = GridManager.deserialise_from_zip(zip_bytes)
         request.app.state.manager_cache[session_id] = manager_instance
-        return JSONResponse(status_code=status.HTTP_200_OK, content={"detail": "ok"})
+        publish_event(request, session_id, {"type": "refresh"})
+        return FastJSONResponse(status_code=status.HTTP_200_OK, content={"detail": "ok"})
     except Exception as e:
         logging.debug(f"{str(e)}")
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={
                 "detail": "Internal server error: likely invalid/corrupted zip file"
@@ -531,7 +839,8 @@ async def reset_all(
     manager: GridManager = Depends(get_manager),
 ):
     request.app.state.manager_cache[session_id] = GridManager()
-    return JSONResponse(
+    publish_event(request, session_id, {"type": "refresh"})
+    return FastJSONResponse(
         status_code=status.HTTP_200_OK, content={"detail": "data resetted"}
     )
 
@@ -541,19 +850,25 @@ async def swap_names(
     request: Request,
     swap_name: SwapNameRequest,
     manager: GridManager = Depends(get_manager),
+    session_id: str | None = Cookie(None, alias="session_id"),
 ):
     target_grid = swap_name.grid_name
     names = swap_name.names
+    snapshot = manager.snapshot(target_grid, names)
     # update handler
-    grid_handler: GridHandler = manager.all_grids[target_grid]
-    swapped = grid_handler.swap_names(names[0], names[1])
+    swapped = manager.swap_names(names[0], names[1], target_grid)
 
     # swap in GridManager hour tracking
     if not swapped:
-        return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return FastJSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
     manager.update_hours(names[0], target_grid)
     manager.update_hours(names[1], target_grid)
-    return JSONResponse(
+    delta = manager.delta(snapshot)
+    publish_event(request, session_id, {"type": "delta", "delta": delta})
+    return FastJSONResponse(
         status_code=status.HTTP_200_OK,
-        content={"detail": f"Swapped {names}, target_grid:{target_grid}"},
+        content={
+            "detail": f"Swapped {names}, target_grid:{target_grid}",
+            "delta": delta,
+        },
     )
@@ -0,0 +1,63 @@
+import json
+import pytest
+import asyncio
+from unittest.mock import MagicMock, AsyncMock
+from src.backend.internal.event_bus import SessionEventBus, REFRESH_FRAME
+from src.backend.routers.planner import stream_events
+
+
+def decode_frame(frame: bytes) -> dict:
+    assert frame.startswith(b"data: ") and frame.endswith(b"\n\n")
+    return json.loads(frame[len(b"data: ") : -2])
+
+
+def test_publish_to_session_subscribers():
+    event_bus = SessionEventBus()
+    queue1 = event_bus.subscribe("session")
+    queue2 = event_bus.subscribe("session")
+    other = event_bus.subscribe("other")
+
+    assert event_bus.publish("session", {"type": "delta", "delta": {}}) == 2
+    assert decode_frame(queue1.get_nowait()) == {"type": "delta", "delta": {}}
+    assert decode_frame(queue2.get_nowait()) == {"type": "delta", "delta": {}}
+    assert other.empty()
+
+    event_bus.unsubscribe("session", queue1)
+    event_bus.unsubscribe("session", queue2)
+    assert event_bus.num_subscribers("session") == 0
+    assert "session" not in event_bus.subscribers
+    assert event_bus.publish("session", {"type": "refresh"}) == 0
+
+
+def test_slow_subscriber_is_told_to_refresh():
+    event_bus = SessionEventBus(max_queue_size=2)
+    queue = event_bus.subscribe("session")
+    for i in range(3):
+        event_bus.publish("session", {"type": "delta", "delta": i})
+
+    assert queue.qsize() == 1
+    assert queue.get_nowait() == REFRESH_FRAME
+
+
+@pytest.mark.asyncio
+async def test_stream_events_unsubscribes_on_disconnect():
+    event_bus = SessionEventBus()
+    request = MagicMock()
+    request.is_disconnected = AsyncMock(side_effect=[False, True])
+    stream = stream_events(request, event_bus, "session")
+    assert await anext(stream) == b": connected\n\n"
+    assert event_bus.num_subscribers("session") == 1
+    event_bus.publish("session", {"type": "refresh"})
+
+    frames = [frame async for frame in stream]
+
+    assert frames == [REFRESH_FRAME]
+    assert event_bus.num_subscribers("session") == 0
+
+
+def test_stream_events_not_started_does_not_subscribe():
+    event_bus = SessionEventBus()
+    stream = stream_events(MagicMock(), event_bus, "session")
+    assert event_bus.num_subscribers("session") == 0
+    del stream  # client gone before the response started
+    assert "session" not in event_bus.subscribers
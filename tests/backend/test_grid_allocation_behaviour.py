@@ -1,3 +1,4 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
 from src.backend.app import create_app
@@ -241,3 +242,282 @@ def test_allocate_grid_both_not_allocated_but_displayed(test_client_factory,day,
     assert response.json()["allocation_size"] == ("0.25" if ":00" in time_block else "0.75")
 
 
+
+
+def test_allocate_batch_matches_single_allocations(test_client_factory):
+    operations = [
+        {"grid_name": "DAY1:MCC", "name": "TEST", "location": "MCC", "allocation_size": "1", "time_block": "08:00"},
+        {"grid_name": "DAY1:MCC", "name": "TEST", "location": "HCC1", "allocation_size": "0.75", "time_block": "09:30"},
+        {"grid_name": "DAY1:HCC1", "name": "TEST2", "location": "HCC1", "allocation_size": "0.25", "time_block": "10:00"},
+        {"grid_name": "DAY3:MCC", "name": "TEST3", "location": "MCC", "allocation_size": "1", "time_block": "00:00"},
+    ]
+    names = {"DAY1:MCC": "TEST", "DAY1:HCC1": "TEST2", "DAY3:MCC": "TEST3"}
+
+    single_manager = GridManager()
+    client = test_client_factory(single_manager)
+    for grid_name, name in names.items():
+        client.post("/grid/add/", json={"grid_name": grid_name, "name": name})
+    for operation in operations:
+        assert client.post("/grid/allocate/", json=operation).status_code == 200
+
+    batch_manager = GridManager()
+    client = test_client_factory(batch_manager)
+    for grid_name, name in names.items():
+        client.post("/grid/add/", json={"grid_name": grid_name, "name": name})
+    response = client.post("/grid/allocate/batch", json={"operations": operations})
+    assert response.status_code == 200
+    assert len(response.json()["operations"]) == len(operations)
+
+    for key, handler in batch_manager.all_grids.items():
+        result, details = handler.equals(single_manager.all_grids[key])
+        assert result, details
+    assert batch_manager.all_hours == single_manager.all_hours
+
+
+def test_allocate_batch_unknown_name_applies_nothing(test_client_factory):
+    manager = GridManager()
+    client = test_client_factory(manager)
+    client.post("/grid/add/", json={"grid_name": "DAY1:MCC", "name": "TEST"})
+    operations = [
+        {"grid_name": "DAY1:MCC", "name": "TEST", "location": "MCC", "allocation_size": "1", "time_block": "08:00"},
+        {"grid_name": "DAY1:MCC", "name": "MISSING", "location": "MCC", "allocation_size": "1", "time_block": "08:00"},
+    ]
+    response = client.post("/grid/allocate/batch", json={"operations": operations})
+
+    assert response.status_code == 404
+    assert manager.all_grids["DAY1:MCC"].hours["TEST"] == 0
+
+
+@pytest.mark.parametrize(
+    "grid_name, start_block, end_block, expected_hours",
+    [("DAY1:MCC", "08:00", "12:30", 5), ("DAY3:MCC", "21:00", "06:30", 10)],
+)
+def test_allocate_range(test_client_factory, grid_name, start_block, end_block, expected_hours):
+    manager = GridManager()
+    client = test_client_factory(manager)
+    client.post("/grid/add/", json={"grid_name": grid_name, "name": "TEST"})
+    body = {
+        "grid_name": grid_name,
+        "name": "TEST",
+        "location": "MCC",
+        "start_block": start_block,
+        "end_block": end_block,
+    }
+    response = client.post("/grid/allocate/range", json=body)
+    assert response.status_code == 200
+    assert manager.all_hours["TEST"]["Total"] == expected_hours
+
+    body["mode"] = "clear"
+    response = client.post("/grid/allocate/range", json=body)
+    assert response.status_code == 200
+    assert manager.all_hours["TEST"]["Total"] == 0
+
+    body["start_block"], body["end_block"] = end_block, start_block
+    response = client.post("/grid/allocate/range", json=body)
+    assert response.status_code == 400
+
+
+def test_get_grid_matches_dataframe_rendering(test_client_factory):
+    manager = GridManager()
+    client = test_client_factory(manager)
+    client.post("/grid/add/", json={"grid_name": "DAY1:HCC1", "name": "TEST"})
+    body = {"grid_name": "DAY1:HCC1", "name": "TEST", "location": "HCC1", "allocation_size": "0.25", "time_block": "08:00"}
+    client.post("/grid/allocate/", json=body)
+
+    handler = manager.all_grids["DAY1:HCC1"]
+    formatted_df = handler.generate_formatted_dataframe(manager.get_blocks_to_remove(1))
+    expected = {"data": handler.df_to_aggrid_format(formatted_df)}
+    for _ in range(2):  # second request is served from the cache
+        response = client.post("/grid/", json={"day": 1, "location": "HCC1"})
+        assert response.status_code == 200
+        assert response.json() == expected
+
+
+@pytest.mark.parametrize(
+    "url, body",
+    [
+        ("/grid/", {"day": 1, "location": "MCC"}),
+        ("/grid/compressed", {"day": 3, "location": "MCC"}),
+        ("/hours/", None),
+        ("/grid/day/", {"day": 1}),
+    ],
+)
+def test_conditional_requests_with_etag(test_client_factory, url, body):
+    manager = GridManager()
+    client = test_client_factory(manager)
+
+    def fetch(headers=None):
+        if body is None:
+            return client.get(url, headers=headers)
+        return client.post(url, json=body, headers=headers)
+
+    response = fetch()
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = fetch({"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    grid_name = "DAY3:MCC" if "compressed" in url else "DAY1:MCC"
+    client.post("/grid/add/", json={"grid_name": grid_name, "name": "TEST"})
+    client.post(
+        "/grid/allocate/",
+        json={"grid_name": grid_name, "name": "TEST", "location": "MCC", "allocation_size": "1", "time_block": "00:00" if grid_name == "DAY3:MCC" else "08:00"},
+    )
+    response = fetch({"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+    # a new manager never matches an old ETag
+    client = test_client_factory(GridManager())
+    assert fetch({"If-None-Match": etag}).status_code == 200
+
+
+def test_hours_payload(test_client_factory):
+    manager = GridManager()
+    client = test_client_factory(manager)
+    client.post("/grid/add/", json={"grid_name": "DAY1:MCC", "name": "TEST"})
+    client.post(
+        "/grid/allocate/",
+        json={"grid_name": "DAY1:MCC", "name": "TEST", "location": "MCC", "allocation_size": "1", "time_block": "08:00"},
+    )
+
+    response = client.get("/hours/")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    jresponse = response.json()
+    assert [col["field"] for col in jresponse["columnDefs"]] == [
+        "Name",
+        "Day 1",
+        "Day 2",
+        "Day 3",
+        "Total",
+    ]
+    row_data, pinned_row_data = manager.get_all_hours()
+    assert jresponse["rowData"] == row_data
+    assert jresponse["pinnedBottomRowData"] == pinned_row_data
+
+
+@pytest.mark.parametrize("day", [1, 2, 3])
+def test_day_grids(test_client_factory, day):
+    manager = GridManager()
+    client = test_client_factory(manager)
+    locations = ["MCC"] if day == 3 else ["MCC", "HCC1", "HCC2"]
+    time_block = "00:00" if day == 3 else "08:00"
+    for i, location in enumerate(locations):
+        grid_name = f"DAY{day}:{location}"
+        client.post("/grid/add/", json={"grid_name": grid_name, "name": f"TEST{i}"})
+        client.post(
+            "/grid/allocate/",
+            json={"grid_name": grid_name, "name": f"TEST{i}", "location": location, "allocation_size": "1", "time_block": time_block},
+        )
+
+    response = client.post("/grid/day/", json={"day": day})
+    assert response.status_code == 200
+    jresponse = response.json()
+    assert list(jresponse["data"]) == locations
+    for location in locations:
+        expected = client.post("/grid/", json={"day": day, "location": location})
+        assert jresponse["data"][location] == expected.json()["data"]
+    assert jresponse["hours"] == {
+        "rowData": [{"Name": f"TEST{i}", "Hours": 1} for i in range(len(locations))],
+        "total": len(locations),
+    }
+
+    response = client.post("/grid/day/", json={"day": day, "compressed": True})
+    if day != 3:
+        assert response.status_code == 400
+    else:
+        expected = client.post("/grid/compressed", json={"day": 3, "location": "MCC"})
+        assert response.json()["data"]["MCC"] == expected.json()["data"]
+
+
+def test_mutation_deltas(test_client_factory):
+    manager = GridManager()
+    client = test_client_factory(manager)
+    grid_name = "DAY1:MCC"
+
+    delta = client.post("/grid/add/", json={"grid_name": grid_name, "name": "TEST"}).json()["delta"]
+    assert delta["target_grid"] == grid_name
+    assert delta["added_names"] == ["TEST"]
+    assert delta["cells"] == []
+    assert [row["Name"] for row in delta["hours"]] == ["TEST"]
+
+    # allocating the first half of an hour splits the joined half block
+    delta = client.post(
+        "/grid/allocate/",
+        json={"grid_name": grid_name, "name": "TEST", "location": "MCC", "allocation_size": "0.25", "time_block": "08:00"},
+    ).json()["delta"]
+    assert delta["cells"] == [{"name": "TEST", "time_block": "08:00", "location": "MCC"}]
+    assert delta["shown_blocks"] == ["08:30"]
+    assert delta["hidden_blocks"] == []
+    assert delta["hours"] == [manager.all_hours["TEST"], manager.all_hours["TOTAL"]]
+
+    delta = client.post(
+        "/grid/allocate/",
+        json={"grid_name": grid_name, "name": "TEST", "location": "MCC", "allocation_size": "0.75", "time_block": "08:30"},
+    ).json()["delta"]
+    assert delta["cells"] == [{"name": "TEST", "time_block": "08:30", "location": "MCC"}]
+    assert delta["shown_blocks"] == []
+    assert delta["hidden_blocks"] == ["08:30"]
+
+    client.post("/grid/add/", json={"grid_name": grid_name, "name": "OTHER"})
+    delta = client.post(
+        "/grid/swap-names/", json={"grid_name": grid_name, "names": ["TEST", "OTHER"]}
+    ).json()["delta"]
+    assert sorted((cell["name"], cell["time_block"], cell["location"]) for cell in delta["cells"]) == [
+        ("OTHER", "08:00", "MCC"),
+        ("OTHER", "08:30", "MCC"),
+        ("TEST", "08:00", "0"),
+        ("TEST", "08:30", "0"),
+    ]
+
+    response = client.request(
+        "DELETE", "/grid/remove/", json={"grid_name": grid_name, "name": "OTHER"}
+    )
+    delta = response.json()["delta"]
+    assert delta["removed_names"] == ["OTHER"]
+    assert delta["removed_hours"] == ["OTHER"]
+    assert delta["hours"] == [manager.all_hours["TOTAL"]]
+
+
+def test_mutations_are_published_to_session(test_client_factory):
+    manager = GridManager()
+    client = test_client_factory(manager)
+    client.cookies.set("session_id", "session")
+    queue = client.app.state.event_bus.subscribe("session")
+
+    response = client.post("/grid/add/", json={"grid_name": "DAY1:MCC", "name": "TEST"})
+    frame = queue.get_nowait()
+    assert frame.startswith(b"data: ")
+    event = json.loads(frame[len(b"data: ") :])
+    assert event == {"type": "delta", "delta": response.json()["delta"]}
+
+    client.post(
+        "/grid/allocate/batch",
+        json={"operations": [{"grid_name": "DAY1:MCC", "name": "TEST", "location": "MCC", "allocation_size": "1", "time_block": "08:00"}]},
+    )
+    event = json.loads(queue.get_nowait()[len(b"data: ") :])
+    assert event == {"type": "refresh", "grids": ["DAY1:MCC"]}
+    assert queue.empty()
+
+
+def test_breaks(test_client_factory):
+    manager = GridManager()
+    client = test_client_factory(manager)
+    client.post("/grid/add/", json={"grid_name": "DAY2:HCC1", "name": "TEST"})
+    client.post(
+        "/grid/allocate/range",
+        json={"grid_name": "DAY2:HCC1", "name": "TEST", "location": "HCC1", "start_block": "11:00", "end_block": "13:00"},
+    )
+
+    response = client.get("/breaks/", params={"day": 2})
+    assert response.status_code == 200
+    assert response.json() == {
+        "day": 2,
+        "no_lunch": ["TEST"],
+        "no_dinner": [],
+        "no_break": ["TEST"],
+    }
+    assert client.get("/breaks/", params={"day": 4}).status_code == 422
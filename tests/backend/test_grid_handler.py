@@ -2,8 +2,9 @@ import pytest
 import random
 import logging
 from typing import cast
-from unittest.mock import patch
-from src.backend.internal.grid_handler import GridHandler
+from src.backend.internal.grid_handler import GridHandler, get_encoded_column_defs
+from src.backend.internal.json_encoder import encode_json
+import src.backend.internal.time_blocks as tb
 
 
 @pytest.fixture
@@ -286,52 +287,47 @@ def test_allocate_shift_replacing_shift(grid_with_shifts: "GridHandler", time_bl
     assert grid_with_shifts.hours[NAME] == original_hours
 
 
-@patch("src.backend.internal.grid_handler.GridHandler.get_shift_location")
-@patch("src.backend.internal.grid_handler.GridHandler.is_shift_allocated")
 @pytest.mark.parametrize(
     "new_location, current_location",
     [("MCC", "0"), ("MCC", "MCC"), ("HCC1", "MCC"), ("HCC2", "MCC")],
 )
-def test_resolve_location_not_day_3(
-    mock_allocated, mock_location, handler_factory, new_location, current_location
+def test_allocate_shift_resolves_location_not_day_3(
+    handler_factory, new_location, current_location
 ):
-    mock_allocated.return_value = True
-    mock_location.return_value = current_location
     handler = handler_factory(location="MCC", day=1)
     handler = cast(GridHandler, handler)
     NAME = "TEST"
-    new_location = new_location
     time_block = "12:00"
+    handler.add_name(NAME)
+    if current_location != "0":
+        handler.allocate_shift(current_location, time_block, NAME)
 
-    final_location, allocated = handler._resolve_location(
-        new_location, time_block, NAME
-    )
+    handler.allocate_shift(new_location, time_block, NAME)
+    final_location = handler.get_shift_location(time_block, NAME)
     if new_location == current_location:
         assert final_location == "0"
     else:
         assert final_location == new_location
 
 
-@patch("src.backend.internal.grid_handler.GridHandler.get_shift_location")
-@patch("src.backend.internal.grid_handler.GridHandler.is_shift_allocated")
 @pytest.mark.parametrize(
     "new_location, current_location",
     [("MCC", "0"), ("MCC", "MCC"), ("HCC1", "MCC"), ("HCC2", "MCC")],
 )
-def test_resolve_location_day_3(
-    mock_allocated, mock_location, handler_factory, new_location, current_location
+def test_allocate_shift_resolves_location_day_3(
+    handler_factory, new_location, current_location
 ):
-    mock_allocated.return_value = True
-    mock_location.return_value = current_location
     handler = handler_factory(location="MCC", day=3)
     handler = cast(GridHandler, handler)
 
     NAME = "TEST"
-    new_location = new_location
     time_block = "22:00"
-    final_location, allocated = handler._resolve_location(
-        new_location, time_block, NAME
-    )
+    handler.add_name(NAME)
+    if current_location != "0":
+        handler.allocate_shift(current_location, time_block, NAME)
+
+    handler.allocate_shift(new_location, time_block, NAME)
+    final_location = handler.get_shift_location(time_block, NAME)
     if current_location == "MCC":
         assert final_location == "0"
     else:
@@ -472,3 +468,219 @@ def test_df_to_aggrid_format(handler_factory):
 
     aggrid_format = handler.df_to_aggrid_format(result)
     print(aggrid_format)
+
+
+@pytest.mark.parametrize("day", [1, 2, 3])
+def test_time_block_index_tables(day):
+    blocks = tb.DAY_BLOCK_MAP[day]
+    for idx, block in enumerate(blocks):
+        assert tb.BLOCK_INDEX_MAP[day][block] == idx
+        assert tb.PAIR_INDEX_MAP[day][block] == idx // 2
+    # a pair index is also the index of the pair's half block in the day's bit mask
+    for idx, block in enumerate(tb.HALF_DAY_BLOCK_MAP[day]):
+        assert tb.PAIR_INDEX_MAP[day][block] == idx
+
+
+def test_grid_template_shared_between_handlers(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # template must not depend on working directory
+    handler1 = GridHandler("MCC", 2)
+    handler2 = GridHandler("HCC1", 2)
+
+    assert handler1.times is handler2.times
+    assert handler1.times == tuple(tb.DAY_BLOCK_MAP[2])
+    handler1.add_name("TEST")
+    assert handler2.get_names() == set()
+
+
+@pytest.mark.parametrize("time_block", ["12:00", "07:30", "18:00"])
+def test_allocate_shift_empty_location_on_empty_cell(
+    grid_with_names: "GridHandler", time_block
+):
+    NAME = "TEST"
+    grid_with_names.allocate_shift(location="0", name=NAME, time_block=time_block)
+
+    assert grid_with_names.hours[NAME] == 0
+    assert grid_with_names.get_shift_location(time_block, NAME) == "0"
+
+
+@pytest.mark.parametrize("time_block", ["76:00", "12:45"])
+def test_allocate_shift_invalid_time_block(
+    grid_with_names: "GridHandler", time_block, caplog
+):
+    grid_with_names.allocate_shift(location="MCC", name="TEST", time_block=time_block)
+
+    assert grid_with_names.hours["TEST"] == 0
+    assert f"{time_block} is not a valid time block" in caplog.text
+
+
+@pytest.mark.parametrize("day", [1, 2, 3])
+def test_recompute_bit_mask_matches_incremental(handler_factory, day):
+    handler = handler_factory(location="MCC", day=day)
+    handler = cast(GridHandler, handler)
+    for name in ["A", "B", "C"]:
+        handler.add_name(name)
+    blocks = tb.DAY_BLOCK_MAP[day]
+    for name in ["A", "B", "C"]:
+        for time_block in random.sample(blocks, 7):
+            handler.allocate_shift(random.choice(["MCC", "HCC1"]), time_block, name)
+    incremental = handler.bit_mask.copy()
+
+    handler.bit_mask.setall(1)  # corrupt the mask
+    handler.recompute_bit_mask()
+
+    assert handler.bit_mask == incremental
+    assert len(handler.bit_mask) == len(blocks) // 2
+
+
+def test_remove_name_recomputes_bit_mask(grid_with_names: "GridHandler"):
+    grid_with_names.allocate_shift("MCC", "08:00", "TEST")
+    assert grid_with_names.bit_mask[1] == 0
+
+    grid_with_names.remove_name("TEST")
+    assert grid_with_names.bit_mask[1] == 1
+
+
+def test_allocate_range_set_and_clear(grid_with_names: "GridHandler"):
+    NAME = "TEST"
+    grid_with_names.allocate_shift("HCC1", "08:30", NAME)
+    assert grid_with_names.allocate_range("MCC", "08:00", "12:30", NAME)
+
+    assert grid_with_names.hours[NAME] == 5
+    assert type(grid_with_names.hours[NAME]) is float
+    for time_block in ["08:00", "08:30", "10:00", "12:30"]:
+        assert grid_with_names.get_shift_location(time_block, NAME) == "MCC"
+    assert grid_with_names.get_shift_location("13:00", NAME) == "0"
+    expected_mask = grid_with_names.bit_mask.copy()
+    grid_with_names.recompute_bit_mask()
+    assert grid_with_names.bit_mask == expected_mask
+
+    assert grid_with_names.allocate_range("MCC", "10:30", "11:00", NAME, mode="clear")
+    assert grid_with_names.hours[NAME] == 4
+    assert grid_with_names.bit_mask[3] == 0  # 10:00 / 10:30 split
+    assert grid_with_names.bit_mask[4] == 0  # 11:00 / 11:30 split
+
+
+def test_allocate_range_day_3_wraps_midnight(handler_factory):
+    handler = handler_factory(location="MCC", day=3)
+    handler = cast(GridHandler, handler)
+    handler.add_name("TEST")
+
+    assert handler.allocate_range("HCC1", "21:00", "06:30", "TEST")
+    assert handler.hours["TEST"] == len(tb.DAY_3_BLOCKS) * 0.5
+    assert handler.get_shift_location("00:00", "TEST") == "MCC"
+
+    assert handler.allocate_range("MCC", "23:30", "01:00", "TEST", mode="clear")
+    assert handler.hours["TEST"] == (len(tb.DAY_3_BLOCKS) - 4) * 0.5
+
+
+@pytest.mark.parametrize(
+    "start_block,end_block", [("12:00", "08:00"), ("08:00", "25:00"), ("06:00", "08:00")]
+)
+def test_allocate_range_invalid(grid_with_names: "GridHandler", start_block, end_block):
+    assert not grid_with_names.allocate_range("MCC", start_block, end_block, "TEST")
+    assert grid_with_names.hours["TEST"] == 0
+
+
+def test_allocate_range_rejects_unknown_mode(grid_with_names: "GridHandler"):
+    grid_with_names.allocate_range("MCC", "08:00", "09:00", "TEST")
+    with pytest.raises(ValueError):
+        grid_with_names.allocate_range("MCC", "08:00", "09:00", "TEST", mode="sett")
+    assert grid_with_names.get_shift_location("08:00", "TEST") == "MCC"
+    assert grid_with_names.hours["TEST"] == 1.5
+
+
+def test_render_aggrid_cached_until_mutation(grid_with_names: "GridHandler"):
+    blocks_to_remove = ["08:30", "09:30"]
+    first = grid_with_names.render_aggrid(blocks_to_remove)
+    assert grid_with_names.render_aggrid(blocks_to_remove) is first
+
+    version = grid_with_names.version
+    grid_with_names.allocate_shift("MCC", "12:00", "TEST")
+    assert grid_with_names.version > version
+    second = grid_with_names.render_aggrid(blocks_to_remove)
+    assert second is not first
+    assert second != first
+
+    # a different day mask is rendered separately
+    assert grid_with_names.render_aggrid(["08:30"]) != second
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_render_aggrid_shares_column_defs(handler_factory, compressed):
+    blocks_to_remove = ["08:30", "09:30"]
+    handler1 = cast(GridHandler, handler_factory(location="MCC", day=1))
+    handler2 = cast(GridHandler, handler_factory(location="MCC", day=1))
+    handler1.add_name("TEST")
+    handler1.allocate_shift("HCC1", "08:00", "TEST")
+
+    # columnDefs are encoded once per process, not per session
+    get_encoded_column_defs.cache_clear()
+    handler1.render_aggrid(blocks_to_remove, compressed)
+    handler2.render_aggrid(blocks_to_remove, compressed)
+    assert get_encoded_column_defs.cache_info().misses == 1
+    assert get_encoded_column_defs.cache_info().hits == 1
+
+    formatted_df = handler1.generate_formatted_dataframe(blocks_to_remove)
+    if compressed:
+        expected = handler1.df_to_aggrid_compressed(formatted_df)
+    else:
+        expected = handler1.df_to_aggrid_format(formatted_df)
+    body = handler1.render_aggrid(blocks_to_remove, compressed)
+    assert body == encode_json({"data": expected})
+
+
+@pytest.mark.parametrize(
+    "location,day,num_names",
+    [("MCC", 1, 0), ("HCC1", 1, 3), ("HCC2", 2, 5), ("MCC", 3, 4)],
+)
+def test_render_aggrid_matches_dataframe_path(
+    handler_factory, location, day, num_names
+):
+    handler = handler_factory(location=location, day=day)
+    handler = cast(GridHandler, handler)
+    for i in range(num_names):
+        handler.add_name(f"NAME_{i}")
+        for time_block in random.sample(tb.DAY_BLOCK_MAP[day], 6):
+            handler.allocate_shift(
+                random.choice(["MCC", "HCC1", "HCC2"]), time_block, f"NAME_{i}"
+            )
+    if num_names > 1:
+        handler.remove_name("NAME_1")
+    blocks_to_remove = random.sample(tb.HALF_DAY_BLOCK_MAP[day], 4)
+
+    formatted_df = handler.generate_formatted_dataframe(blocks_to_remove)
+    expected = handler.df_to_aggrid_format(formatted_df)
+    # byte equality also checks the key order of every row
+    assert handler.render_aggrid(blocks_to_remove) == encode_json({"data": expected})
+
+
+@pytest.mark.parametrize("num_names", [0, 1, 6])
+def test_render_aggrid_compressed_matches_dataframe_path(handler_factory, num_names):
+    handler = handler_factory(location="MCC", day=3)
+    handler = cast(GridHandler, handler)
+    for i in range(num_names):
+        handler.add_name(f"NAME_{i}")
+        for time_block in random.sample(tb.DAY_3_BLOCKS, 8):
+            handler.allocate_shift("MCC", time_block, f"NAME_{i}")
+    if num_names > 3:
+        handler.allocate_range("MCC", "21:00", "23:30", "NAME_3")
+        handler.swap_names("NAME_0", "NAME_2")
+        handler.rename("NAME_NEW", "NAME_1")
+        handler.remove_name("NAME_4")
+    blocks_to_remove = random.sample(tb.DAY_3_HALF_BLOCKS, 3)
+
+    formatted_df = handler.generate_formatted_dataframe(blocks_to_remove)
+    expected = handler.df_to_aggrid_compressed(formatted_df)
+    body = handler.render_aggrid(blocks_to_remove, compressed=True)
+    assert body == encode_json({"data": expected})
+
+
+def test_set_data_hours_are_floats(handler_factory):
+    handler = cast(GridHandler, handler_factory(location="MCC", day=1))
+    handler.add_name("TEST")
+    handler.allocate_shift("MCC", "08:00", "TEST")
+
+    handler.set_data(handler.data)
+
+    assert handler.hours["TEST"] == 0.5
+    assert type(handler.hours["TEST"]) is float
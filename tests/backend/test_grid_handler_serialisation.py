@@ -83,3 +83,12 @@ def test_deserialisation(handler_factory_with_data,location,day):
     if details is not None:
         print(f"Equals failed: {details}")
     assert result
+
+def test_deserialisation_rebuilds_corrupted_bit_mask(handler_factory_with_data):
+    handler = handler_factory_with_data("MCC", 1)
+    handler = cast(GridHandler, handler)
+    metadata, df_bytes = handler.serialise_for_storage()
+    metadata["bit_mask"] = "1" * len(metadata["bit_mask"])
+
+    deserialised_handler = GridHandler.deserialise_from_storage(metadata, df_bytes)
+    assert deserialised_handler.bit_mask == handler.bit_mask
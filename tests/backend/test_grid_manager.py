@@ -1,7 +1,7 @@
 import pytest
 from typing import cast
 import itertools
-from src.backend.internal.grid_manager import GridManager
+from src.backend.internal.grid_manager import GridManager, get_empty_planner
 from src.backend.internal.grid_handler import GridHandler
 import src.backend.internal.time_blocks as tb
 
@@ -102,6 +102,21 @@ def test_class_init(test_manager: "GridManager"):
     assert expected_configs == set()
 
 
+def test_class_init_copies_prototype():
+    manager1 = GridManager()
+    manager2 = GridManager()
+    handler1 = manager1.all_grids["DAY1:MCC"]
+    handler1.add_name("TEST")
+    handler1.allocate_shift("MCC", "08:00", "TEST")
+
+    assert manager2.all_grids["DAY1:MCC"].get_names() == set()
+    assert manager2.all_grids["DAY1:MCC"].bit_mask.all()
+    for key, prototype in get_empty_planner().items():
+        assert prototype is not manager1.all_grids[key]
+        assert prototype.get_names() == set()
+        assert prototype.bit_mask.all()
+
+
 def test_format_keys_join_time_block_one_dataframe(test_manager, handler_factory):
     handler = handler_factory(location="MCC", day=3)
     handler = cast(GridHandler, handler)
@@ -398,3 +413,119 @@ def test_get_all_hours(manager_all_grid_with_name: "GridManager"):
     all_hour_data, _ = manager.get_all_hours()
     for hour_list in all_hour_data:
         assert sum(hour_list) == 1.0
+
+
+def test_add_remove_name_tracks_existing_names(test_manager: "GridManager"):
+    assert test_manager.add_name("test_a", "DAY1:MCC")
+    assert not test_manager.add_name("TEST_A", "DAY1:MCC")
+    assert test_manager.add_name("TEST_A", "DAY1:HCC1")
+    assert test_manager.name_exists("TEST_A", 1)
+    assert not test_manager.name_exists("TEST_A", 2)
+    assert test_manager.name_counts["DAY1"]["TEST_A"] == 2
+
+    test_manager.remove_name("TEST_A", "DAY1:MCC")
+    assert test_manager.name_exists("TEST_A", 1)  # still in DAY1:HCC1
+    assert test_manager.remove_name("TEST_A", "DAY1:MCC") is None
+    test_manager.remove_name("TEST_A", "DAY1:HCC1")
+    assert not test_manager.name_exists("TEST_A", 1)
+    assert "TEST_A" not in test_manager.name_counts["DAY1"]
+
+    # incremental tracking agrees with a full rebuild
+    test_manager.add_name("TEST_B", "DAY2:HCC2")
+    test_manager.add_name("TEST_C", "DAY3:MCC")
+    incremental = {k: v.copy() for k, v in test_manager.existing_names.items()}
+    for day in range(1, 4):
+        test_manager.update_existing_names(day)
+    assert test_manager.existing_names == incremental
+
+
+def test_name_grids_reverse_index(test_manager: "GridManager"):
+    test_manager.add_name("TEST_A", "DAY1:MCC")
+    test_manager.add_name("TEST_A", "DAY2:HCC1")
+    test_manager.add_name("TEST_B", "DAY1:MCC")
+    assert test_manager.get_name_grids("TEST_A") == {"DAY1:MCC", "DAY2:HCC1"}
+
+    assert test_manager.swap_names("TEST_A", "TEST_B", "DAY1:MCC")
+    assert test_manager.get_name_grids("TEST_B") == {"DAY1:MCC"}
+
+    assert test_manager.rename_name("TEST_C", "TEST_A", "DAY2:HCC1")
+    assert not test_manager.rename_name("TEST_C", "TEST_B", "DAY2:HCC1")
+    assert test_manager.get_name_grids("TEST_A") == {"DAY1:MCC"}
+    assert test_manager.get_name_grids("TEST_C") == {"DAY2:HCC1"}
+    assert test_manager.name_exists("TEST_C", 2)
+    assert not test_manager.name_exists("TEST_A", 2)
+
+    test_manager.remove_name("TEST_A", "DAY1:MCC")
+    assert test_manager.get_name_grids("TEST_A") == set()
+    assert "TEST_A" not in test_manager.name_grids
+
+
+def test_update_hours_uses_name_grids(test_manager: "GridManager"):
+    test_manager.add_name("TEST_A", "DAY1:MCC")
+    test_manager.update_hours("TEST_A", "DAY1:MCC")
+    test_manager.add_name("TEST_A", "DAY2:MCC")
+    test_manager.update_hours("TEST_A", "DAY2:MCC")
+    test_manager.all_grids["DAY1:MCC"].allocate_shift("MCC", "08:00", "TEST_A")
+    test_manager.update_hours("TEST_A", "DAY1:MCC")
+    test_manager.all_grids["DAY2:MCC"].allocate_shift("MCC", "08:00", "TEST_A")
+    test_manager.update_hours("TEST_A", "DAY2:MCC")
+    assert test_manager.all_hours["TEST_A"]["Total"] == 1
+    assert test_manager.all_hours["TOTAL"]["Total"] == 1
+
+    test_manager.remove_name("TEST_A", "DAY1:MCC")
+    test_manager.update_hours("TEST_A", "DAY1:MCC")
+    assert test_manager.all_hours["TEST_A"]["Day 1"] == 0
+    assert test_manager.all_hours["TEST_A"]["Total"] == 0.5
+
+    test_manager.remove_name("TEST_A", "DAY2:MCC")
+    test_manager.update_hours("TEST_A", "DAY2:MCC")
+    assert "TEST_A" not in test_manager.all_hours
+    assert test_manager.all_hours["TOTAL"]["Total"] == 0
+
+
+def test_check_breaks_across_locations(test_manager: "GridManager"):
+    test_manager.add_name("SPLIT", "DAY1:MCC")
+    test_manager.add_name("SPLIT", "DAY1:HCC1")
+    test_manager.add_name("HAS_BREAK", "DAY1:MCC")
+    test_manager.add_name("NO_DINNER", "DAY1:HCC2")
+    mcc = cast(GridHandler, test_manager.all_grids["DAY1:MCC"])
+    hcc1 = cast(GridHandler, test_manager.all_grids["DAY1:HCC1"])
+    hcc2 = cast(GridHandler, test_manager.all_grids["DAY1:HCC2"])
+
+    # lunch window split between two locations, no single grid sees a full window
+    mcc.allocate_range("MCC", "11:00", "12:00", "SPLIT")
+    hcc1.allocate_range("HCC1", "12:30", "13:00", "SPLIT")
+    mcc.allocate_range("MCC", "11:00", "12:30", "HAS_BREAK")
+    hcc2.allocate_range("HCC2", "17:00", "18:00", "NO_DINNER")
+    assert mcc.check_lunch_and_dinner() == set()
+
+    result = test_manager.check_breaks(1)
+    assert result == {
+        "day": 1,
+        "no_lunch": ["SPLIT"],
+        "no_dinner": ["NO_DINNER"],
+        "no_break": ["NO_DINNER", "SPLIT"],
+    }
+    # cached until a grid of the day changes
+    assert test_manager.check_breaks(1) is result
+    mcc.allocate_shift("MCC", "13:00", "HAS_BREAK")
+    assert test_manager.check_breaks(1)["no_lunch"] == ["HAS_BREAK", "SPLIT"]
+
+
+def test_check_breaks_names_added_to_handlers(test_manager: "GridManager"):
+    # names added without GridManager.add_name are not in name_counts
+    handler = cast(GridHandler, test_manager.all_grids["DAY2:HCC1"])
+    handler.add_name("DIRECT")
+    handler.allocate_range("HCC1", "11:00", "13:00", "DIRECT")
+
+    assert test_manager.check_breaks(2)["no_lunch"] == ["DIRECT"]
+
+
+def test_check_breaks_night_duty(test_manager: "GridManager"):
+    test_manager.add_name("TEST", "DAY3:MCC")
+    handler = cast(GridHandler, test_manager.all_grids["DAY3:MCC"])
+    handler.allocate_range("MCC", "21:00", "06:30", "TEST")
+
+    # night duty does not cover the meal windows
+    assert test_manager.check_breaks(3)["no_break"] == []
+    assert handler.check_lunch_and_dinner() == set()
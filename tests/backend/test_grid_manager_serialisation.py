@@ -74,3 +74,96 @@ def test_deserialisation(test_manager):
     
     assert deserialised_manager.existing_names == test_manager.existing_names
     assert deserialised_manager.all_hours == test_manager.all_hours
+
+
+@pytest.fixture
+def manager_with_data():
+    manager = GridManager()
+    for key in manager.all_grids:
+        handler = cast(GridHandler, manager.all_grids[key])
+        for name in ["TEST_A", "TEST_B"]:
+            manager.add_name(f"{name}_{handler.location}", key)
+        start, end = ("21:00", "23:00") if handler.day == 3 else ("08:00", "09:30")
+        handler.allocate_range(handler.location, start, end, f"TEST_A_{handler.location}")
+        handler.allocate_shift("HCC1", start, f"TEST_B_{handler.location}")
+        for name in handler.get_names():
+            manager.update_hours(name, key)
+    return manager
+
+
+def test_snapshot_roundtrip(manager_with_data):
+    snapshot = manager_with_data.serialise_to_snapshot()
+    assert snapshot.startswith(b"NSPS")
+    assert len(snapshot) < len(manager_with_data.serialise_to_zip())
+
+    deserialised_manager = GridManager.deserialise_from_snapshot(snapshot)
+
+    assert list(deserialised_manager.all_grids) == list(manager_with_data.all_grids)
+    for key, handler in deserialised_manager.all_grids.items():
+        assert handler.equals(manager_with_data.all_grids[key]) == (True, None)
+    assert deserialised_manager.existing_names == manager_with_data.existing_names
+    assert deserialised_manager.name_grids == manager_with_data.name_grids
+    assert deserialised_manager.all_hours == manager_with_data.all_hours
+    assert list(deserialised_manager.all_hours) == list(manager_with_data.all_hours)
+
+
+def test_deserialise_detects_format(manager_with_data):
+    for data in (
+        manager_with_data.serialise_to_snapshot(),
+        manager_with_data.serialise_to_zip(),
+    ):
+        deserialised_manager = GridManager.deserialise(data)
+        assert deserialised_manager.all_hours == manager_with_data.all_hours
+
+
+def test_snapshot_rejects_other_versions(manager_with_data):
+    snapshot = bytearray(manager_with_data.serialise_to_snapshot())
+    snapshot[4] = 99
+    with pytest.raises(ValueError):
+        GridManager.deserialise_from_snapshot(bytes(snapshot))
+    with pytest.raises(ValueError):
+        GridManager.deserialise_from_snapshot(manager_with_data.serialise_to_zip())
+
+
+@pytest.mark.parametrize("serialise", ["serialise_to_snapshot", "serialise_to_zip"])
+def test_lazy_deserialise_loads_grids_on_access(manager_with_data, serialise):
+    data = getattr(manager_with_data, serialise)()
+    deserialised_manager = GridManager.deserialise(data, lazy=True)
+
+    assert deserialised_manager.all_grids.loaded() == []
+    assert deserialised_manager.existing_names == manager_with_data.existing_names
+    assert deserialised_manager.name_grids == manager_with_data.name_grids
+
+    day_grids = deserialised_manager.get_day_grids(1)
+    assert len(deserialised_manager.all_grids.loaded()) == len(day_grids)
+    assert all(key.startswith("DAY1:") for key in day_grids)
+
+    for key, handler in deserialised_manager.all_grids.items():
+        assert handler.equals(manager_with_data.all_grids[key]) == (True, None)
+
+
+def test_lazy_snapshot_passes_unloaded_grids_through(manager_with_data):
+    snapshot = manager_with_data.serialise_to_snapshot()
+    deserialised_manager = GridManager.deserialise(snapshot, lazy=True)
+    assert deserialised_manager.serialise_to_snapshot() == snapshot
+
+    deserialised_manager.get_day_grids(2)
+    assert deserialised_manager.serialise_to_snapshot() == snapshot
+    assert len(deserialised_manager.all_grids) > len(
+        deserialised_manager.all_grids.loaded()
+    )
+
+
+def test_lazily_loaded_grids_record_to_journal(manager_with_data):
+    deserialised_manager = GridManager.deserialise(
+        manager_with_data.serialise_to_snapshot(), lazy=True
+    )
+    handler = deserialised_manager.all_grids["DAY3:MCC"]
+    handler.add_name("LATE")
+    assert deserialised_manager.journal[-1][:2] == ("DAY3:MCC", "add")
+
+
+def test_snapshot_rejects_truncated_codes(manager_with_data):
+    snapshot = manager_with_data.serialise_to_snapshot()
+    with pytest.raises(ValueError):
+        GridManager.deserialise_from_snapshot(snapshot[:-1], lazy=True)
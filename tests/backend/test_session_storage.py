@@ -0,0 +1,234 @@
+import base64
+from unittest.mock import MagicMock
+from src.backend.internal.grid_manager import GridManager
+from src.backend.internal.lru_cache import (
+    CustomLRUCache,
+    STORAGE_FORMAT,
+    EXPIRY_REFRESH_INTERVAL,
+    decode_stored_data,
+)
+from src.backend.routers.planner import restore_from_database
+
+
+def make_manager() -> GridManager:
+    manager = GridManager()
+    manager.add_name("TEST", "DAY1:MCC")
+    manager.all_grids["DAY1:MCC"].allocate_shift("MCC", "08:00", "TEST")
+    manager.update_hours("TEST", "DAY1:MCC")
+    return manager
+
+
+def mock_db(document: dict) -> MagicMock:
+    db = MagicMock()
+    doc_ref = db.collection.return_value.document.return_value
+    doc_ref.get.return_value.to_dict.return_value = document
+    return db
+
+
+def test_sync_stores_raw_snapshot_bytes():
+    db = MagicMock()
+    cache = CustomLRUCache(10, db)
+    manager = make_manager()
+
+    cache.sync_to_firebase("session", manager)
+
+    doc_ref = db.collection.return_value.document.return_value
+    document = doc_ref.set.call_args.args[0]
+    assert isinstance(document["data"], bytes)
+    assert document["format"] == STORAGE_FORMAT
+    assert document["size"] == len(document["data"])
+    assert not manager.requires_sync
+
+    restored = restore_from_database(mock_db(document), "session")
+    assert restored.all_hours == manager.all_hours
+
+
+def test_restore_legacy_base64_documents():
+    manager = make_manager()
+    for data in (manager.serialise_to_zip(), manager.serialise_to_snapshot()):
+        document = {"data": base64.b64encode(data).decode("utf-8")}
+        assert decode_stored_data(document) == data
+
+        restored = restore_from_database(mock_db(document), "session")
+        assert restored.all_hours == manager.all_hours
+
+
+class FakeDocument:
+    """In memory stand in for a Firestore document reference"""
+
+    def __init__(self):
+        self.data = None
+        self.writes = []
+
+    def set(self, data: dict):
+        self.writes.append("set")
+        self.data = dict(data)
+
+    def update(self, fields: dict):
+        self.writes.append("update")
+        for key, value in fields.items():
+            if key == "journal":
+                value = self.data.get("journal", []) + list(value.values)
+            self.data[key] = value
+
+    def get(self):
+        snapshot = MagicMock()
+        snapshot.to_dict.return_value = self.data
+        return snapshot
+
+
+def fake_db() -> tuple[MagicMock, FakeDocument]:
+    db = MagicMock()
+    document = FakeDocument()
+    db.collection.return_value.document.return_value = document
+    return db, document
+
+
+def edit(manager: GridManager):
+    """Mutations applied the way the planner endpoints apply them"""
+    for name, grid in [("TEST_A", "DAY1:MCC"), ("TEST_B", "DAY1:MCC"), ("TEST_C", "DAY3:MCC")]:
+        manager.add_name(name, grid)
+        manager.update_hours(name, grid)
+    handler = manager.all_grids["DAY1:MCC"]
+    handler.allocate_shift("MCC", "08:00", "TEST_A")
+    manager.update_hours("TEST_A", "DAY1:MCC")
+    handler.allocate_range("HCC1", "09:00", "11:30", "TEST_B")
+    manager.update_hours("TEST_B", "DAY1:MCC")
+    manager.swap_names("TEST_A", "TEST_B", "DAY1:MCC")
+    manager.update_hours("TEST_A", "DAY1:MCC")
+    manager.update_hours("TEST_B", "DAY1:MCC")
+    manager.all_grids["DAY3:MCC"].allocate_range("MCC", "23:00", "02:00", "TEST_C")
+    manager.update_hours("TEST_C", "DAY3:MCC")
+    manager.remove_name("TEST_A", "DAY1:MCC")
+    manager.update_hours("TEST_A", "DAY1:MCC")
+
+
+def assert_same_state(restored: GridManager, manager: GridManager):
+    for key, handler in manager.all_grids.items():
+        assert restored.all_grids[key].equals(handler) == (True, None)
+    assert restored.all_hours == manager.all_hours
+    assert list(restored.all_hours) == list(manager.all_hours)
+    assert restored.existing_names == manager.existing_names
+
+
+def test_sync_appends_journal_segments():
+    db, document = fake_db()
+    cache = CustomLRUCache(10, db)
+    manager = GridManager()
+
+    cache.sync_to_firebase("session", manager)  # first sync writes a snapshot
+    edit(manager)
+    cache.sync_to_firebase("session", manager)
+    manager.all_grids["DAY1:MCC"].allocate_shift("HCC2", "09:00", "TEST_B")
+    manager.update_hours("TEST_B", "DAY1:MCC")
+    cache.sync_to_firebase("session", manager)
+    cache.sync_to_firebase("session", manager)  # unchanged, skipped
+
+    assert document.writes == ["set", "update", "update"]
+    assert len(document.data["journal"]) == 2
+    assert manager.journal == []
+
+    restored = restore_from_database(db, "session")
+    assert_same_state(restored, manager)
+    # the restored session keeps appending to the same document
+    assert not restored.needs_compaction()
+    assert restored.journal_length == manager.journal_length
+
+
+def test_remove_shift_is_journaled():
+    db, document = fake_db()
+    cache = CustomLRUCache(10, db)
+    manager = make_manager()
+    cache.sync_to_firebase("session", manager)
+
+    manager.all_grids["DAY1:MCC"].remove_shift("08:00", "TEST")
+    manager.update_hours("TEST", "DAY1:MCC")
+    cache.sync_to_firebase("session", manager)
+
+    assert document.writes == ["set", "update"]
+    restored = restore_from_database(db, "session")
+    assert restored.all_grids["DAY1:MCC"].get_shift_location("08:00", "TEST") == "0"
+    assert_same_state(restored, manager)
+
+
+def test_sync_compacts_journal(monkeypatch):
+    monkeypatch.setattr("src.backend.internal.grid_manager.JOURNAL_COMPACTION_THRESHOLD", 5)
+    db, document = fake_db()
+    cache = CustomLRUCache(10, db)
+    manager = GridManager()
+    cache.sync_to_firebase("session", manager)
+
+    edit(manager)  # more operations than the threshold
+    assert manager.needs_compaction()
+    cache.sync_to_firebase("session", manager)
+
+    assert document.writes == ["set", "set"]
+    assert document.data["journal"] == []
+    assert manager.journal_length == 0
+    assert_same_state(restore_from_database(db, "session"), manager)
+
+
+def test_unreplayable_operation_forces_snapshot():
+    manager = GridManager()
+    manager.mark_stored(len(manager.journal), compacted=True)
+    handler = manager.all_grids["DAY1:MCC"]
+    handler.add_name("TEST")
+    assert not manager.needs_compaction()
+
+    handler.set_data(handler.data)
+    assert manager.needs_compaction()
+
+
+def test_sync_skips_unchanged_sessions():
+    db, document = fake_db()
+    cache = CustomLRUCache(10, db)
+    manager = GridManager()
+    edit(manager)
+    cache.sync_to_firebase("session", manager)
+
+    # reads only flag the session, toggling a shift twice leaves it unchanged
+    handler = manager.all_grids["DAY1:MCC"]
+    for _ in range(2):
+        handler.allocate_shift("MCC", "12:00", "TEST_B")
+        manager.update_hours("TEST_B", "DAY1:MCC")
+    manager.requires_sync = True
+    cache.sync_to_firebase("session", manager)
+
+    assert document.writes == ["set"]
+    assert manager.journal == []
+    assert not manager.requires_sync
+
+    # only the expiry is refreshed, once the refresh interval has passed
+    manager.expiry_refreshed_at -= EXPIRY_REFRESH_INTERVAL
+    expire_at = document.data["expireAt"]
+    cache.sync_to_firebase("session", manager)
+    assert document.writes == ["set", "update"]
+    assert document.data["expireAt"] > expire_at
+    assert document.data["journal"] == []
+
+    handler.allocate_shift("MCC", "12:00", "TEST_B")
+    cache.sync_to_firebase("session", manager)
+    assert document.writes == ["set", "update", "update"]
+    assert len(document.data["journal"]) == 1
+
+
+def test_restored_sessions_are_not_rewritten():
+    db, document = fake_db()
+    cache = CustomLRUCache(10, db)
+    manager = GridManager()
+    edit(manager)
+    cache.sync_to_firebase("session", manager)
+    manager.all_grids["DAY1:MCC"].allocate_shift("HCC2", "09:00", "TEST_B")
+    manager.update_hours("TEST_B", "DAY1:MCC")
+    cache.sync_to_firebase("session", manager)
+
+    # read only restore -> evict cycles, the digest is read from the document
+    for _ in range(3):
+        restored = restore_from_database(db, "session")
+        assert restored.persisted_digest == document.data["digest"]
+        restored.requires_sync = True
+        cache.sync_to_firebase("session", restored)
+        assert restored.expiry_refreshed_at == document.data["updated"]
+
+    assert document.writes == ["set", "update"]
+    assert_same_state(restore_from_database(db, "session"), manager)
@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+from src.backend.internal.shift_matrix import (
+    ShiftMatrix,
+    LOCATION_TO_CODE,
+    EMPTY_CODE,
+    encode,
+    decode,
+)
+from src.backend.internal.grid_handler import GridHandler
+
+
+@pytest.fixture
+def matrix_with_columns():
+    matrix = ShiftMatrix(4, capacity=2)
+    matrix.add_column("A", encode(["MCC", "0", "0", "HCC1"]))
+    matrix.add_column("B")
+    matrix.add_column("C", encode(["HCC2", "HCC2", "0", "0"]))
+    return matrix
+
+
+def test_encode_decode_roundtrip():
+    locations = ["0", "MCC", "HCC1", "HCC2", "0"]
+    codes = encode(locations)
+    assert codes.dtype == np.uint8
+    assert decode(codes).tolist() == locations
+
+
+def test_add_column_grows_capacity(matrix_with_columns: ShiftMatrix):
+    assert matrix_with_columns.columns == ["A", "B", "C"]
+    assert matrix_with_columns.codes.shape[1] >= 3
+    assert matrix_with_columns.view().shape == (4, 3)
+    assert decode(matrix_with_columns.column("B")).tolist() == ["0"] * 4
+
+
+def test_remove_column_keeps_order(matrix_with_columns: ShiftMatrix):
+    removed = matrix_with_columns.remove_column("A")
+
+    assert decode(removed).tolist() == ["MCC", "0", "0", "HCC1"]
+    assert matrix_with_columns.columns == ["B", "C"]
+    assert matrix_with_columns.column_index == {"B": 0, "C": 1}
+    assert matrix_with_columns.get(0, "C") == LOCATION_TO_CODE["HCC2"]
+
+
+def test_swap_columns(matrix_with_columns: ShiftMatrix):
+    matrix_with_columns.swap_columns("A", "C")
+
+    assert matrix_with_columns.columns == ["C", "B", "A"]
+    assert decode(matrix_with_columns.column("C")).tolist() == [
+        "MCC",
+        "0",
+        "0",
+        "HCC1",
+    ]
+
+
+def test_set_and_get(matrix_with_columns: ShiftMatrix):
+    matrix_with_columns.set(2, "B", LOCATION_TO_CODE["MCC"])
+    assert matrix_with_columns.get(2, "B") == LOCATION_TO_CODE["MCC"]
+    matrix_with_columns.set(2, "B", EMPTY_CODE)
+    assert matrix_with_columns.get(2, "B") == EMPTY_CODE
+
+
+def test_copy_is_independent(matrix_with_columns: ShiftMatrix):
+    copied = matrix_with_columns.copy()
+    copied.set(1, "A", LOCATION_TO_CODE["MCC"])
+    copied.add_column("D")
+
+    assert not copied.equals(matrix_with_columns)
+    assert matrix_with_columns.get(1, "A") == EMPTY_CODE
+    assert "D" not in matrix_with_columns.columns
+
+
+def test_handler_data_matches_matrix():
+    handler = GridHandler("MCC", 1)
+    handler.add_name("TEST")
+    handler.allocate_shift("HCC1", "08:00", "TEST")
+
+    data = handler.data
+    assert data.columns.to_list() == ["DAY", "Time", "TEST"]
+    assert data.loc[data.Time == "08:00", "TEST"].iloc[0] == "HCC1"
+    assert handler.grid.nbytes == len(handler.times) * handler.grid.codes.shape[1]
+